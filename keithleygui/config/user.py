@@ -7,7 +7,8 @@
 """
 This module provides user configuration file management features.
 
-It's based on the ConfigParser module (present in the standard library).
+It's based on a lightweight, regex based parser which implements the parts of the
+ConfigParser interface (present in the standard library) used by keithleygui.
 """
 
 # Std imports
@@ -20,6 +21,7 @@ import shutil
 import time
 import codecs
 import configparser as cp
+from contextlib import contextmanager
 from distutils.version import LooseVersion
 
 # Local imports
@@ -115,28 +117,119 @@ class NoDefault:
     pass
 
 
+class FastConfigParser:
+    """
+    Minimal replacement for :class:`configparser.ConfigParser`
+
+    Only supports flat 'option = value' pairs grouped into sections, without
+    interpolation, multi-line values or a DEFAULT section. The file is parsed with two
+    regular expressions and stored as nested dictionaries {section: {option: value}}.
+    Errors are reported with the exceptions from :mod:`configparser`.
+    """
+
+    SECTION_RE = re.compile(r"^\[(.+?)\][ \t]*$", re.M)
+    OPTION_RE = re.compile(r"^([^=\s#;][^=\s]*)[ \t]*=[ \t]*(.*)$", re.M)
+
+    def __init__(self):
+        self._sections = {}
+
+    def sections(self):
+        return list(self._sections)
+
+    def has_section(self, section):
+        return section in self._sections
+
+    def add_section(self, section):
+        if section in self._sections:
+            raise cp.DuplicateSectionError(section)
+        self._sections[section] = {}
+
+    def remove_section(self, section):
+        return self._sections.pop(section, None) is not None
+
+    def _get_section(self, section):
+        try:
+            return self._sections[section]
+        except KeyError:
+            raise cp.NoSectionError(section)
+
+    def options(self, section):
+        return list(self._get_section(section))
+
+    def has_option(self, section, option):
+        return option in self._sections.get(section, ())
+
+    def get(self, section, option, raw=False):
+        try:
+            return self._get_section(section)[option]
+        except KeyError:
+            raise cp.NoOptionError(option, section)
+
+    def items(self, section, raw=False):
+        return list(self._get_section(section).items())
+
+    def set(self, section, option, value):
+        self._get_section(section)[option] = value
+
+    def remove_option(self, section, option):
+        return self._get_section(section).pop(option, None) is not None
+
+    def read(self, filenames, encoding=None):
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        read_ok = []
+        for fname in filenames:
+            try:
+                with open(fname, encoding=encoding) as fp:
+                    self.read_file(fp, fname)
+            except OSError:
+                continue
+            read_ok.append(fname)
+        return read_ok
+
+    def read_file(self, f, source=None):
+        self.read_string(f.read(), source or "<???>")
+
+    def read_string(self, string, source="<string>"):
+        # files written in text mode on Windows have CRLF line endings
+        string = string.replace("\r\n", "\n").replace("\r", "\n")
+        parts = self.SECTION_RE.split(string)
+
+        match = self.OPTION_RE.search(parts[0])
+        if match:
+            lineno = parts[0].count("\n", 0, match.start()) + 1
+            raise cp.MissingSectionHeaderError(source, lineno, match.group(0))
+
+        for section, body in zip(parts[1::2], parts[2::2]):
+            options = self._sections.setdefault(section, {})
+            for option, value in self.OPTION_RE.findall(body):
+                options[option] = value.rstrip()
+
+    def write(self, fp):
+        for section, options in self._sections.items():
+            fp.write("[%s]\n" % section)
+            for option, value in options.items():
+                fp.write("%s = %s\n" % (option, value))
+            fp.write("\n")
+
+
 # =============================================================================
 # Defaults class
 # =============================================================================
 
 
-class DefaultsConfig(cp.ConfigParser):
+class DefaultsConfig(FastConfigParser):
     """
     Class used to save defaults to a file and as base class for
     UserConfig
     """
 
     def __init__(self, name, subfolder):
-        if PY2:
-            cp.ConfigParser.__init__(self)
-        else:
-            cp.ConfigParser.__init__(self, interpolation=None)
+        FastConfigParser.__init__(self)
 
         self.name = name
         self.subfolder = subfolder
 
-        self.optionxform = str
-
     def _set(self, section, option, value, verbose):
         """
         Private set method
@@ -147,7 +240,7 @@ class DefaultsConfig(cp.ConfigParser):
             value = repr(value)
         if verbose:
             print("%s[ %s ] = %s" % (section, option, value))
-        cp.ConfigParser.set(self, section, option, value)
+        FastConfigParser.set(self, section, option, value)
 
     def _save(self):
         """
@@ -211,7 +304,7 @@ class DefaultsConfig(cp.ConfigParser):
 
 class UserConfig(DefaultsConfig):
     """
-    UserConfig class, based on ConfigParser
+    UserConfig class, based on FastConfigParser
     name: name of the config
     defaults: dictionnary containing options
               *or* list of tuples (section_name, options)
@@ -237,6 +330,10 @@ class UserConfig(DefaultsConfig):
     ):
         DefaultsConfig.__init__(self, name, subfolder)
         self.raw = 1 if raw_mode else 0
+        self._section_cache = {}
+        self._value_cache = {}
+        self._transaction_depth = 0
+        self._save_pending = False
         if version is not None and re.match(r"^(\d+).(\d+).(\d+)$", version) is None:
             raise ValueError(
                 "Version number %r is incorrect - must be in X.Y.Z format" % version
@@ -280,6 +377,30 @@ class UserConfig(DefaultsConfig):
                 # If no defaults are defined, set .ini file settings as default
                 self.set_as_defaults()
 
+    def _save(self):
+        """
+        Save config into the associated .ini file, deferred inside a transaction
+        """
+        if self._transaction_depth > 0:
+            self._save_pending = True
+        else:
+            DefaultsConfig._save(self)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager which collects all changes made inside the block and writes
+        the .ini file only once on exit
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0 and self._save_pending:
+                self._save_pending = False
+                self._save()
+
     def get_version(self, version="0.0.0"):
         """Return configuration (not application!) version"""
         return self.get(self.DEFAULT_SECTION_NAME, "version", version)
@@ -297,19 +418,23 @@ class UserConfig(DefaultsConfig):
             if osp.isfile(fname):
                 try:
                     with codecs.open(fname, encoding="utf-8") as configfile:
-                        self.readfp(configfile)
+                        self.read_file(configfile, fname)
                 except IOError:
                     print("Failed reading file", fname)
+                self._section_cache.clear()
+                self._value_cache.clear()
 
         except cp.MissingSectionHeaderError:
             print("Warning: File contains no section headers.")
 
     def _load_old_defaults(self, old_version):
         """Read old defaults"""
-        old_defaults = cp.ConfigParser()
+        old_defaults = FastConfigParser()
         path = osp.dirname(self.filename())
         path = osp.join(path, "defaults")
-        old_defaults.read(osp.join(path, "defaults-" + old_version + ".ini"))
+        old_defaults.read(
+            osp.join(path, "defaults-" + old_version + ".ini"), encoding="utf-8"
+        )
         return old_defaults
 
     def _save_new_defaults(self, defaults, new_version, subfolder):
@@ -390,6 +515,14 @@ class UserConfig(DefaultsConfig):
             raise RuntimeError("Argument 'option' must be a string")
         return section
 
+    def _set(self, section, option, value, verbose):
+        """
+        Private set method, invalidates cached values of the section
+        """
+        DefaultsConfig._set(self, section, option, value, verbose)
+        self._section_cache.pop(section, None)
+        self._value_cache.pop(section, None)
+
     def get_default(self, section, option):
         """
         Get Default value for a given (section, option)
@@ -425,15 +558,25 @@ class UserConfig(DefaultsConfig):
                 self.set(section, option, default)
                 return default
 
-        value = cp.ConfigParser.get(self, section, option, raw=self.raw)
+        # numbers and bools are immutable and can be cached after parsing
+        section_values = self._value_cache.setdefault(section, {})
+        try:
+            return section_values[option]
+        except KeyError:
+            pass
+
+        value = FastConfigParser.get(self, section, option, raw=self.raw)
         # Use type of default_value to parse value correctly
         default_value = self.get_default(section, option)
         if isinstance(default_value, bool):
             value = ast.literal_eval(value)
+            section_values[option] = value
         elif isinstance(default_value, float):
             value = float(value)
+            section_values[option] = value
         elif isinstance(default_value, int):
             value = int(value)
+            section_values[option] = value
         elif is_text_string(default_value):
             if PY2:
                 try:
@@ -456,6 +599,25 @@ class UserConfig(DefaultsConfig):
                 pass
         return value
 
+    def section_dict(self, section):
+        """
+        Get all options of a section as a dictionary of parsed values
+
+        The snapshot is built on first access and reused until an option of the
+        section is changed. It should be treated as read-only.
+        """
+        try:
+            return self._section_cache[section]
+        except KeyError:
+            pass
+
+        if not self.has_section(section):
+            raise cp.NoSectionError(section)
+
+        values = {option: self.get(section, option) for option in self.options(section)}
+        self._section_cache[section] = values
+        return values
+
     def set_default(self, section, option, default_value):
         """
         Set Default value for a given (section, option)
@@ -493,10 +655,22 @@ class UserConfig(DefaultsConfig):
         if save:
             self._save()
 
+    def update_section(self, section, values, verbose=False, save=True):
+        """
+        Set several options of a section, the config file is written only once
+        """
+        with self.transaction():
+            for option, value in values.items():
+                self.set(section, option, value, verbose, save)
+
     def remove_section(self, section):
-        cp.ConfigParser.remove_section(self, section)
+        FastConfigParser.remove_section(self, section)
+        self._section_cache.pop(section, None)
+        self._value_cache.pop(section, None)
         self._save()
 
     def remove_option(self, section, option):
-        cp.ConfigParser.remove_option(self, section, option)
+        FastConfigParser.remove_option(self, section, option)
+        self._section_cache.pop(section, None)
+        self._value_cache.pop(section, None)
         self._save()
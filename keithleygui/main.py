@@ -6,8 +6,13 @@
 
 # system imports
 import os.path as osp
-import configparser as cp
+import logging
+import math
+import random
+import threading
 import time
+from operator import itemgetter
+import weakref
 
 # external imports
 import pkg_resources as pkgr
@@ -17,24 +22,39 @@ from keithley2600 import Keithley2600, FETResultTable
 from keithley2600.keithley_driver import KeithleyIOError
 import numpy as np
 
+
 # local imports
 from keithleygui.pyqt_labutils import LedIndicator, SettingsWidget, ConnectionDialog
-from keithleygui.pyqtplot_canvas import SweepDataPlot
 from keithleygui.config.main import CONF
 
+logger = logging.getLogger(__name__)
+
 MAIN_UI_PATH = pkgr.resource_filename("keithleygui", "main.ui")
 
+try:
+    # compiled from main.ui by setup.py at build time
+    from keithleygui.ui_main import Ui_MainWindow
+except ImportError:
+    Ui_MainWindow, _ = uic.loadUiType(MAIN_UI_PATH)
+
+# SMU names found on a connected Keithley, cleared on connect / disconnect
+_SMU_CACHE = weakref.WeakKeyDictionary()
+
 
 def _get_smus(keithley):
     """安全获取SMU列表，如果无法获取，则返回默认值"""
     try:
         # 检查设备是否已连接
-        if hasattr(keithley, 'connected') and not keithley.connected:
+        if not keithley.connected:
             # 设备未连接，返回默认SMU列表
             smu_list = ["smu1", "smu2"]
+        elif keithley in _SMU_CACHE:
+            smu_list = list(_SMU_CACHE[keithley])
         else:
             # 尝试从设备获取SMU列表
             smu_list = [attr_name for attr_name in dir(keithley) if attr_name.startswith("smu")]
+            if smu_list:
+                _SMU_CACHE[keithley] = list(smu_list)
     except Exception:
         # 出现任何错误，返回默认值
         smu_list = ["smu1", "smu2"]
@@ -47,6 +67,61 @@ def _get_smus(keithley):
     return smu_list
 
 
+# non-numeric entries accepted in voltage lists
+_SENTINELS = {"trailing": "trailing"}
+
+
+def _parse_voltage_list(text):
+    """
+    Parses a comma separated list of voltages. All numeric entries are converted in a
+    single call to a float64 array. If the list contains the "trailing" option, a list
+    of the parsed values with "trailing" at its original position is returned instead.
+    """
+    items = [item.strip() for item in text.split(",")]
+    is_trailing = [item in _SENTINELS for item in items]
+
+    values = np.array(
+        [item for item, trailing in zip(items, is_trailing) if not trailing],
+        dtype=np.float64,
+    )
+
+    if not any(is_trailing):
+        return values
+
+    values = iter(values.tolist())
+    return [
+        _SENTINELS[item] if trailing else next(values)
+        for item, trailing in zip(items, is_trailing)
+    ]
+
+
+def _minmax_decimate(x, y, max_points):
+    """
+    Reduces a trace to about ``max_points`` points for plotting. The data is split
+    into bins and the minimum and maximum of every bin are kept in their original
+    order, so that peaks remain visible. Points after the last full bin are kept.
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    bin_size = -(-n // (max_points // 2))  # ceil division
+    n_bins = n // bin_size
+    n_binned = n_bins * bin_size
+
+    binned = y[:n_binned].reshape(n_bins, bin_size)
+    i_min = binned.argmin(axis=1)
+    i_max = binned.argmax(axis=1)
+
+    offsets = np.arange(n_bins) * bin_size
+    idx = np.empty((n_bins, 2), dtype=np.intp)
+    idx[:, 0] = offsets + np.minimum(i_min, i_max)
+    idx[:, 1] = offsets + np.maximum(i_min, i_max)
+    idx = np.concatenate((idx.ravel(), np.arange(n_binned, n)))
+
+    return x[idx], y[idx]
+
+
 class SMUSettingsWidget(SettingsWidget):
 
     SENSE_LOCAL = 0
@@ -68,21 +143,19 @@ class SMUSettingsWidget(SettingsWidget):
 
     def load_defaults(self):
 
-        if self.smu_name != "--":
+        if self.smu_name != "--" and CONF.has_section(self.smu_name):
 
-            try:
-                sense_mode = CONF.get(self.smu_name, "sense")
+            d = CONF.section_dict(self.smu_name)
+            sense_mode = d.get("sense", "SENSE_LOCAL")
 
-                if sense_mode == "SENSE_LOCAL":
-                    self.sense_type.setCurrentIndex(self.SENSE_LOCAL)
-                elif sense_mode == "SENSE_REMOTE":
-                    self.sense_type.setCurrentIndex(self.SENSE_REMOTE)
+            if sense_mode == "SENSE_LOCAL":
+                self.sense_type.setCurrentIndex(self.SENSE_LOCAL)
+            elif sense_mode == "SENSE_REMOTE":
+                self.sense_type.setCurrentIndex(self.SENSE_REMOTE)
 
-                self.limit_i.setValue(CONF.get(self.smu_name, "limiti"))
-                self.limit_v.setValue(CONF.get(self.smu_name, "limitv"))
-                self.high_c.setChecked(CONF.get(self.smu_name, "highc"))
-            except cp.NoSectionError:
-                pass
+            self.limit_i.setValue(d.get("limiti", 0.1))
+            self.limit_v.setValue(d.get("limitv", 200.0))
+            self.high_c.setChecked(d.get("highc", False))
 
     def save_defaults(self):
 
@@ -116,8 +189,6 @@ class SweepSettingsWidget(SettingsWidget):
         self.smu_gate = self.addSelectionField("Gate SMU:", self.smu_list, 0)
         self.smu_drain = self.addSelectionField("Drain SMU:", self.smu_list, 1)
 
-        self.load_defaults()
-
         self.smu_gate.currentIndexChanged.connect(self.on_smu_gate_changed)
         self.smu_drain.currentIndexChanged.connect(self.on_smu_drain_changed)
 
@@ -138,11 +209,12 @@ class SweepSettingsWidget(SettingsWidget):
             
     def load_defaults(self):
 
-        self.t_int.setValue(CONF.get("Sweep", "tInt"))
-        self.t_settling.setValue(CONF.get("Sweep", "delay"))
-        self.sweep_type.setCurrentIndex(int(CONF.get("Sweep", "pulsed")))
-        self.smu_gate.setCurrentText(CONF.get("Sweep", "gate"))
-        self.smu_drain.setCurrentText(CONF.get("Sweep", "drain"))
+        d = CONF.section_dict("Sweep")
+        self.t_int.setValue(d["tInt"])
+        self.t_settling.setValue(d["delay"])
+        self.sweep_type.setCurrentIndex(int(d["pulsed"]))
+        self.smu_gate.setCurrentText(d["gate"])
+        self.smu_drain.setCurrentText(d["drain"])
 
     def save_defaults(self):
         CONF.set("Sweep", "tInt", self.t_int.value())
@@ -172,6 +244,8 @@ class SweepSettingsWidget(SettingsWidget):
 class TransferSweepSettingsWidget(SettingsWidget):
     def __init__(self):
         super().__init__()
+        # set once the defaults have been loaded into the fields
+        self._loaded = False
 
         self.vg_start = self.addDoubleField("Vg start:", 0, "V")
         self.vg_stop = self.addDoubleField("Vg stop:", 0, "V")
@@ -179,14 +253,17 @@ class TransferSweepSettingsWidget(SettingsWidget):
         self.vd_list = self.addListField("Drain voltages:", [-5, -60])
         self.vd_list.setAcceptedStrings(["trailing"])
 
-        self.load_defaults()
-
     def load_defaults(self):
 
-        self.vg_start.setValue(CONF.get("Sweep", "VgStart"))
-        self.vg_stop.setValue(CONF.get("Sweep", "VgStop"))
-        self.vg_step.setValue(CONF.get("Sweep", "VgStep"))
-        self.vd_list.setValue(CONF.get("Sweep", "VdList"))
+        d = CONF.section_dict("Sweep")
+        self.vg_start.setValue(d["VgStart"])
+        self.vg_stop.setValue(d["VgStop"])
+        self.vg_step.setValue(d["VgStep"])
+        self.vd_list.setValue(d["VdList"])
+
+    def drain_voltages(self):
+        """Returns the drain voltages as array, or as list if "trailing" is given."""
+        return _parse_voltage_list(self.vd_list.text())
 
     def save_defaults(self):
         CONF.set("Sweep", "VgStart", self.vg_start.value())
@@ -198,20 +275,25 @@ class TransferSweepSettingsWidget(SettingsWidget):
 class OutputSweepSettingsWidget(SettingsWidget):
     def __init__(self):
         super().__init__()
+        # set once the defaults have been loaded into the fields
+        self._loaded = False
 
         self.vd_start = self.addDoubleField("Vd start:", 0, "V")
         self.vd_stop = self.addDoubleField("Vd stop:", 0, "V")
         self.vd_step = self.addDoubleField("Vd step:", 0, "V")
         self.vg_list = self.addListField("Gate voltages:", [0, -20, -40, -60])
 
-        self.load_defaults()
-
     def load_defaults(self):
 
-        self.vd_start.setValue(CONF.get("Sweep", "VdStart"))
-        self.vd_stop.setValue(CONF.get("Sweep", "VdStop"))
-        self.vd_step.setValue(CONF.get("Sweep", "VdStep"))
-        self.vg_list.setValue(CONF.get("Sweep", "VgList"))
+        d = CONF.section_dict("Sweep")
+        self.vd_start.setValue(d["VdStart"])
+        self.vd_stop.setValue(d["VdStop"])
+        self.vd_step.setValue(d["VdStep"])
+        self.vg_list.setValue(d["VgList"])
+
+    def gate_voltages(self):
+        """Returns the gate voltages as array."""
+        return _parse_voltage_list(self.vg_list.text())
 
     def save_defaults(self):
         CONF.set("Sweep", "VdStart", self.vd_start.value())
@@ -223,6 +305,8 @@ class OutputSweepSettingsWidget(SettingsWidget):
 class IVSweepSettingsWidget(SettingsWidget):
     def __init__(self, keithley):
         super().__init__()
+        # set once the defaults have been loaded into the fields
+        self._loaded = False
         self.keithley = keithley
         try:
             self.smu_list = _get_smus(self.keithley)
@@ -234,8 +318,6 @@ class IVSweepSettingsWidget(SettingsWidget):
         self.v_step = self.addDoubleField("Vd step:", 0, "V")
         self.smu_sweep = self.addSelectionField("Sweep SMU:", self.smu_list, 0)
 
-        self.load_defaults()
-
     def update_smu_list(self):
         try:
             self.smu_list = _get_smus(self.keithley)
@@ -247,10 +329,11 @@ class IVSweepSettingsWidget(SettingsWidget):
 
     def load_defaults(self):
 
-        self.v_start.setValue(CONF.get("Sweep", "VStart"))
-        self.v_stop.setValue(CONF.get("Sweep", "VStop"))
-        self.v_step.setValue(CONF.get("Sweep", "VStep"))
-        self.smu_sweep.setCurrentText(CONF.get("Sweep", "smu_sweep"))
+        d = CONF.section_dict("Sweep")
+        self.v_start.setValue(d["VStart"])
+        self.v_stop.setValue(d["VStop"])
+        self.v_step.setValue(d["VStep"])
+        self.smu_sweep.setCurrentText(d["smu_sweep"])
 
     def save_defaults(self):
         CONF.set("Sweep", "VStart", self.v_start.value())
@@ -260,15 +343,31 @@ class IVSweepSettingsWidget(SettingsWidget):
 
 
 # noinspection PyArgumentList
-class KeithleyGuiApp(QtWidgets.QMainWindow):
+class KeithleyGuiApp(QtWidgets.QMainWindow, Ui_MainWindow):
     """ Provides a GUI for transfer and output sweeps on the Keithley 2600."""
 
     QUIT_ON_CLOSE = True
 
+    # maximum number of points drawn in the real-time plot
+    REALTIME_MAX_PLOT_POINTS = 2000
+
+    # asks the real-time worker to stop, delivered to the worker thread
+    realtime_stop_sig = QtCore.pyqtSignal()
+    realtime_voltage_sig = QtCore.pyqtSignal(float)
+
+    # emitted after the Keithley was connected, disconnected or reconfigured
+    connection_changed_sig = QtCore.pyqtSignal()
+
+    STATE_DISCONNECTED = 0
+    STATE_IDLE = 1
+    STATE_BUSY = 2
+
     def __init__(self, keithley=None):
         super().__init__()
-        # load user interface layout from .ui file
-        uic.loadUi(MAIN_UI_PATH, self)
+        # set up user interface layout from the compiled .ui file
+        self.setupUi(self)
+        # suspend repaints while widgets are added, layouts are updated only once
+        self.setUpdatesEnabled(False)
 
         try:
             if keithley:
@@ -312,24 +411,39 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.tabWidgetSweeps.widget(2).layout().addWidget(self.iv_sweep_settings)
         self.groupBoxSweepSettings.layout().addWidget(self.general_sweep_settings)
 
-        # create tabs for smu settings
+        # defaults of sweep tabs are only loaded when the tab is first shown
+        self._sweep_settings_tabs = {
+            0: self.transfer_sweep_settings,
+            1: self.output_sweep_settings,
+            2: self.iv_sweep_settings,
+        }
+        self.general_sweep_settings.load_defaults()
+        self._lazy_load_tab_defaults(self.tabWidgetSweeps.currentIndex())
+
+        # create tabs for smu settings, widgets are kept in a pool by smu name so
+        # that they can be reused when an SMU disappears and comes back later
         self.smu_tabs = []
+        self._smu_tab_pool = {}
         for smu_name in self.smu_list:
-            tab = SMUSettingsWidget(smu_name)
+            tab = self._get_smu_tab(smu_name, self.smu_tabs)
             self.tabWidgetSettings.addTab(tab, smu_name)
             self.smu_tabs.append(tab)
 
-        # create plot widget
-        self.canvas = SweepDataPlot()
-        self.gridLayout2.addWidget(self.canvas)
+        # reserve space for the plot widget, it is created on first use
+        self._canvas = None
+        self._canvas_placeholder = QtWidgets.QWidget()
+        self._canvas_placeholder.setSizePolicy(
+            QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding
+        )
+        self.gridLayout2.addWidget(self._canvas_placeholder)
 
         # create LED indicator
         self.led = LedIndicator(self)
         self.statusBar.addPermanentWidget(self.led)
         self.led.setChecked(False)
 
-        # create connection dialog
-        self.connectionDialog = ConnectionDialog(self, self.keithley, CONF)
+        # connection dialog, created when first opened
+        self._connection_dialog = None
 
         # 添加实时测量标签页
         self.realtime_tab = QtWidgets.QWidget()
@@ -365,6 +479,19 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.voltage_zero_button = QtWidgets.QPushButton("0V")
         self.voltage_up_small_button = QtWidgets.QPushButton("+0.1V")
         self.voltage_down_small_button = QtWidgets.QPushButton("-0.1V")
+
+        # 电压步进表，None表示将电压设为0V
+        self._voltage_steps = {
+            self.voltage_up_button: 1.0,
+            self.voltage_down_button: -1.0,
+            self.voltage_zero_button: None,
+            self.voltage_up_small_button: 0.1,
+            self.voltage_down_small_button: -0.1,
+        }
+        # 同一事件循环周期内的点击被合并为一次电压写入
+        self._pending_dv = 0.0
+        self._pending_zero = False
+        self._dv_scheduled = False
         
         voltage_buttons_layout = QtWidgets.QHBoxLayout()
         voltage_buttons_layout.addWidget(self.voltage_down_button)
@@ -385,6 +512,8 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.realtime_time_label = QtWidgets.QLabel("0.00 s")
         self.realtime_voltage_label = QtWidgets.QLabel("0.00 V")
         self.realtime_current_label = QtWidgets.QLabel("0.00 A")
+        # 上次显示的数值（已按显示精度取整），未改变时跳过格式化和重绘
+        self._last_label_values = None
         
         realtime_values_layout.addRow("时间:", self.realtime_time_label)
         realtime_values_layout.addRow("电压:", self.realtime_voltage_label)
@@ -421,83 +550,133 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         
         realtime_layout.addLayout(realtime_buttons_layout)
         
-        # 实时测量线程
+        # 实时测量线程及在其中运行的工作对象
         self.realtime_thread = None
+        self.realtime_worker = None
+        # 实时测量数据由GUI线程保存，最新值和是否有未显示的新数据
+        self.realtime_buffer = SampleBuffer()
+        self._rt_latest = None
+        self._rt_pending = False
+        # 传给on_realtime_data的数据，每次刷新时更新其中的值而不重新创建
+        self._rt_snapshot = dict.fromkeys(("time", "voltage", "current", "last_value"))
+        # 绘图数据在线程池中抽取，同时最多进行一次；清除数据时增加generation，
+        # 以丢弃基于旧数据的结果
+        self._render_signals = RenderSignals()
+        self._render_signals.done_sig.connect(self.on_realtime_rendered)
+        self._render_in_flight = False
+        self._render_again = False
+        self._rt_generation = 0
+        # 实时电流曲线及其标题，数据更新时只调用setData
+        self._rt_line = None
+        self._rt_title = None
+        # 以固定频率刷新实时数据显示，与采样频率无关
+        self.realtime_refresh_timer = QtCore.QTimer(self)
+        self.realtime_refresh_timer.setInterval(50)
+        self.realtime_refresh_timer.timeout.connect(self.on_realtime_refresh)
+        # 连续调节电压时只在停止调节100 ms后将最后的值发送给测量线程
+        self._voltage_timer = QtCore.QTimer(self)
+        self._voltage_timer.setSingleShot(True)
+        self._voltage_timer.setInterval(100)
+        self._voltage_timer.timeout.connect(self._apply_pending_voltage)
+        # 测量线程的状态消息最多每250 ms显示一次，期间只保留最新的消息
+        self._status_timer = QtCore.QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(250)
+        self._status_timer.timeout.connect(self._show_pending_status)
+        self._pending_status = None
+        self.realtime_voltage.valueChanged.connect(self.on_realtime_voltage_changed)
+
+        self.setUpdatesEnabled(True)
 
         # restore last position and size
         self.restore_geometry()
 
         # update GUI status and connect callbacks
+        self._last_conn_state = None
+        self._connection_worker = None
+        self._linefreq_cached = None
+        self._smu_objects = {}
         self.actionSaveSweepData.setEnabled(False)
         self.connect_ui_callbacks()
-        self.on_load_default()
         self.update_gui_connection()
 
-        # connection update timer: check periodically if keithley is connected
+        # connection changes are signalled by connection_changed_sig, this timer is
+        # only a keep-alive to detect a Keithley which was switched off or unplugged
         self.connection_status_update = QtCore.QTimer()
         self.connection_status_update.timeout.connect(self.update_gui_connection)
-        self.connection_status_update.start(10000)  # 10 sec
+        self.connection_status_update.start(60000)  # 60 sec
 
     def update_smu_list(self):
         """Update all smu lists in the interface."""
         try:
             # 安全获取SMU列表
-            self.smu_list = _get_smus(self.keithley)
+            new_smu_list = _get_smus(self.keithley)
+            if new_smu_list == self.smu_list:
+                return
+            self.smu_list = new_smu_list
     
             # update smu lists in widgets
             try:
-                if hasattr(self, 'transfer_sweep_settings'):
-                    self.transfer_sweep_settings.update_smu_list()
-                if hasattr(self, 'output_sweep_settings'):
-                    self.output_sweep_settings.update_smu_list()
-                if hasattr(self, 'iv_sweep_settings'):
-                    self.iv_sweep_settings.update_smu_list()
-                if hasattr(self, 'general_sweep_settings'):
-                    self.general_sweep_settings.update_smu_list()
+                self.iv_sweep_settings.update_smu_list()
+                self.general_sweep_settings.update_smu_list()
             except Exception as e:
                 print(f"更新SMU下拉列表出错: {str(e)}")
             
             # 更新实时测量SMU列表
-            if hasattr(self, 'realtime_smu'):
-                try:
-                    current_text = self.realtime_smu.currentText()
-                    self.realtime_smu.clear()
-                    self.realtime_smu.addItems(self.smu_list)
-                    # 尝试恢复之前的选择
-                    index = self.realtime_smu.findText(current_text)
-                    if index >= 0:
-                        self.realtime_smu.setCurrentIndex(index)
-                except Exception as e:
-                    print(f"更新实时测量SMU列表出错: {str(e)}")
+            try:
+                current_text = self.realtime_smu.currentText()
+                self.realtime_smu.clear()
+                self.realtime_smu.addItems(self.smu_list)
+                # 尝试恢复之前的选择
+                index = self.realtime_smu.findText(current_text)
+                if index >= 0:
+                    self.realtime_smu.setCurrentIndex(index)
+            except Exception as e:
+                print(f"更新实时测量SMU列表出错: {str(e)}")
     
             # update smu settings tabs
             try:
-                self.smu_tabs = []
-                self.tabWidgetSettings.clear()
-                for smu_name in self.smu_list:
-                    tab = SMUSettingsWidget(smu_name)
-                    self.tabWidgetSettings.addTab(tab, smu_name)
-                    self.smu_tabs.append(tab)
-                    
-                if hasattr(self, 'iv_sweep_settings'):
-                    self.iv_sweep_settings.update_smu_list()
-                if hasattr(self, 'general_sweep_settings'):
-                    self.general_sweep_settings.update_smu_list()
+                self._update_smu_tabs()
             except Exception as e:
                 print(f"更新SMU设置标签页出错: {str(e)}")
                 
         except Exception as e:
             print(f"更新SMU列表时出错: {str(e)}")
 
-    @staticmethod
-    def _string_to_vd(string):
-        try:
-            return float(string)
-        except ValueError:
-            if "trailing" in string:
-                return "trailing"
-            else:
-                raise ValueError("Invalid drain voltage.")
+    def _get_smu_tab(self, smu_name, used_tabs):
+        """
+        Returns the pooled settings widget for ``smu_name`` or creates a new one. The
+        "--" placeholder may occur more than once, only its first widget is pooled.
+        """
+        tab = self._smu_tab_pool.get(smu_name)
+        if tab is None:
+            tab = self._smu_tab_pool[smu_name] = SMUSettingsWidget(smu_name)
+        elif tab in used_tabs:
+            tab = SMUSettingsWidget(smu_name)
+        return tab
+
+    def _update_smu_tabs(self):
+        """Add and remove SMU settings tabs to match the current smu list."""
+        smu_tabs = []
+
+        for smu_name in self.smu_list:
+            smu_tabs.append(self._get_smu_tab(smu_name, smu_tabs))
+
+        for tab in self.smu_tabs:
+            if tab not in smu_tabs:
+                self.tabWidgetSettings.removeTab(self.tabWidgetSettings.indexOf(tab))
+                if self._smu_tab_pool.get(tab.smu_name) is not tab:
+                    tab.deleteLater()
+
+        # insert new tabs and move existing ones to their new position
+        for index, tab in enumerate(smu_tabs):
+            current_index = self.tabWidgetSettings.indexOf(tab)
+            if current_index != index:
+                if current_index != -1:
+                    self.tabWidgetSettings.removeTab(current_index)
+                self.tabWidgetSettings.insertTab(index, tab, tab.smu_name)
+
+        self.smu_tabs = smu_tabs
 
     def closeEvent(self, event):
         if self.QUIT_ON_CLOSE:
@@ -509,27 +688,49 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     # GUI setup
     # =============================================================================
 
+    @property
+    def canvas(self):
+        """Plot widget, pyqtgraph is only imported and set up on first access."""
+        if self._canvas is None:
+            from keithleygui.pyqtplot_canvas import SweepDataPlot
+
+            self._canvas = SweepDataPlot()
+            self.gridLayout2.replaceWidget(self._canvas_placeholder, self._canvas)
+            self._canvas_placeholder.deleteLater()
+            self._canvas_placeholder = None
+        return self._canvas
+
+    @property
+    def connectionDialog(self):
+        """Connection settings dialog, created on first access."""
+        if self._connection_dialog is None:
+            self._connection_dialog = ConnectionDialog(self, self.keithley, CONF)
+            # connected after the dialog's own handler which reconnects the Keithley
+            self._connection_dialog.buttonBox.accepted.connect(
+                self.on_connection_settings_changed
+            )
+        return self._connection_dialog
+
     def restore_geometry(self):
-        x = CONF.get("Window", "x")
-        y = CONF.get("Window", "y")
-        w = CONF.get("Window", "width")
-        h = CONF.get("Window", "height")
+        window = CONF.section_dict("Window")
+        x, y, w, h = itemgetter("x", "y", "width", "height")(window)
 
         self.setGeometry(x, y, w, h)
 
     def save_geometry(self):
         geo = self.geometry()
-        CONF.set("Window", "height", geo.height())
-        CONF.set("Window", "width", geo.width())
-        CONF.set("Window", "x", geo.x())
-        CONF.set("Window", "y", geo.y())
+        CONF.update_section(
+            "Window",
+            {"height": geo.height(), "width": geo.width(), "x": geo.x(), "y": geo.y()},
+        )
 
     def connect_ui_callbacks(self):
         """Connect buttons and menus to callbacks."""
         self.pushButtonRun.clicked.connect(self.on_sweep_clicked)
         self.pushButtonAbort.clicked.connect(self.on_abort_clicked)
 
-        self.actionSettings.triggered.connect(self.connectionDialog.open)
+        self.actionSettings.triggered.connect(self.on_settings_clicked)
+        self.connection_changed_sig.connect(self.update_gui_connection)
         self.actionConnect.triggered.connect(self.on_connect_clicked)
         self.actionDisconnect.triggered.connect(self.on_disconnect_clicked)
         self.actionExit.triggered.connect(self.exit_)
@@ -537,6 +738,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.actionLoad_data_from_file.triggered.connect(self.on_load_clicked)
         self.actionSaveDefaults.triggered.connect(self.on_save_default)
         self.actionLoadDefaults.triggered.connect(self.on_load_default)
+        self.tabWidgetSweeps.currentChanged.connect(self._lazy_load_tab_defaults)
         
         # 实时测量控件绑定
         self.pushButtonStartRealtime.clicked.connect(self.on_start_realtime_clicked)
@@ -546,11 +748,8 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.pushButtonClearRealtime.clicked.connect(self.on_clear_realtime_clicked)
         
         # 电压控制和调节按钮绑定
-        self.voltage_up_button.clicked.connect(self.on_voltage_up_clicked)
-        self.voltage_down_button.clicked.connect(self.on_voltage_down_clicked)
-        self.voltage_zero_button.clicked.connect(self.on_voltage_zero_clicked)
-        self.voltage_up_small_button.clicked.connect(self.on_voltage_up_small_clicked)
-        self.voltage_down_small_button.clicked.connect(self.on_voltage_down_small_clicked)
+        for button in self._voltage_steps:
+            button.clicked.connect(self.on_voltage_step_clicked)
 
     # =============================================================================
     # Measurement callbacks
@@ -560,25 +759,35 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         """
         Applies SMU settings to Keithley before a measurement.
         Warning: self.keithley.reset() will reset those settings.
+
+        All settings are sent as a single TSP chunk instead of one write per
+        attribute.
         """
+        commands = []
+
         for tab in self.smu_tabs:
 
-            smu = getattr(self.keithley, tab.smu_name)
+            smu = tab.smu_name
+            if smu == "--":
+                continue
 
             if tab.sense_type.currentIndex() == tab.SENSE_LOCAL:
-                smu.sense = smu.SENSE_LOCAL
+                commands.append(f"{smu}.sense = {smu}.SENSE_LOCAL")
             elif tab.sense_type.currentIndex() == tab.SENSE_REMOTE:
-                smu.sense = smu.SENSE_REMOTE
+                commands.append(f"{smu}.sense = {smu}.SENSE_REMOTE")
 
             lim_i = tab.limit_i.value()
-            smu.source.limiti = lim_i
-            smu.trigger.source.limiti = lim_i
+            commands.append(f"{smu}.source.limiti = {lim_i!r}")
+            commands.append(f"{smu}.trigger.source.limiti = {lim_i!r}")
 
             lim_v = tab.limit_v.value()
-            smu.source.limitv = lim_v
-            smu.trigger.source.limitv = lim_v
+            commands.append(f"{smu}.source.limitv = {lim_v!r}")
+            commands.append(f"{smu}.trigger.source.limitv = {lim_v!r}")
 
-            smu.source.highc = int(tab.high_c.isChecked())
+            commands.append(f"{smu}.source.highc = {int(tab.high_c.isChecked())}")
+
+        if commands:
+            self.keithley._write(" ".join(commands))
 
     @QtCore.pyqtSlot()
     def on_sweep_clicked(self):
@@ -601,7 +810,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             params["VgStart"] = self.transfer_sweep_settings.vg_start.value()
             params["VgStop"] = self.transfer_sweep_settings.vg_stop.value()
             params["VgStep"] = self.transfer_sweep_settings.vg_step.value()
-            params["VdList"] = self.transfer_sweep_settings.vd_list.value()
+            params["VdList"] = self.transfer_sweep_settings.drain_voltages()
 
         elif self.tabWidgetSweeps.currentIndex() == 1:
             self.statusBar.showMessage("    Recording output curve.")
@@ -610,7 +819,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             params["VdStart"] = self.output_sweep_settings.vd_start.value()
             params["VdStop"] = self.output_sweep_settings.vd_stop.value()
             params["VdStep"] = self.output_sweep_settings.vd_step.value()
-            params["VgList"] = self.output_sweep_settings.vg_list.value()
+            params["VgList"] = self.output_sweep_settings.gate_voltages()
 
         elif self.tabWidgetSweeps.currentIndex() == 2:
             self.statusBar.showMessage("    Recording IV curve.")
@@ -620,7 +829,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             params["VStop"] = self.iv_sweep_settings.v_stop.value()
             params["VStep"] = self.iv_sweep_settings.v_step.value()
             smusweep = self.iv_sweep_settings.smu_sweep.currentText()
-            params["smu_sweep"] = getattr(self.keithley, smusweep)
+            params["smu_sweep"] = self._get_smu(smusweep)
 
         else:
             return
@@ -630,12 +839,12 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         smu_drain = self.general_sweep_settings.smu_drain.currentText()
         params["tInt"] = self.general_sweep_settings.t_int.value()
         params["delay"] = self.general_sweep_settings.t_settling.value()
-        params["smu_gate"] = getattr(self.keithley, smu_gate)
-        params["smu_drain"] = getattr(self.keithley, smu_drain)
+        params["smu_gate"] = self._get_smu(smu_gate)
+        params["smu_drain"] = self._get_smu(smu_drain)
         params["pulsed"] = bool(self.general_sweep_settings.sweep_type.currentIndex())
 
         # check if integration time is valid, return otherwise
-        freq = self.keithley.localnode.linefreq
+        freq = self._get_linefreq()
 
         if not 0.001 / freq < params["tInt"] < 25.0 / freq:
             msg = (
@@ -686,29 +895,99 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     # Interface callbacks
     # =============================================================================
 
+    def _clear_instrument_cache(self):
+        """Drops cached Keithley objects, the driver recreates them on connect."""
+        _SMU_CACHE.pop(self.keithley, None)
+        self._smu_objects.clear()
+        self._linefreq_cached = None
+
+    def _get_smu(self, smu_name):
+        """Returns the Keithley SMU object for ``smu_name``, cached until reconnect."""
+        try:
+            return self._smu_objects[smu_name]
+        except KeyError:
+            smu = self._smu_objects[smu_name] = getattr(self.keithley, smu_name)
+            return smu
+
+    def _get_linefreq(self):
+        """Returns the mains frequency, queried only once per connection."""
+        if self._linefreq_cached is None:
+            self._linefreq_cached = self.keithley.localnode.linefreq
+        return self._linefreq_cached
+
+    def _start_connection_worker(self, connect, slot):
+        """Connects or disconnects the Keithley in the thread pool."""
+        self.actionConnect.setEnabled(False)
+        self.actionDisconnect.setEnabled(False)
+        # actions are restored by the next state update
+        self._last_conn_state = None
+        # the connection state changes in the worker thread, real-time controls
+        # which depend on it are disabled until the worker has finished
+        self._set_realtime_controls_enabled(False)
+
+        self._connection_worker = ConnectionWorker(self.keithley, connect)
+        self._connection_worker.signals.finished_sig.connect(slot)
+        QtCore.QThreadPool.globalInstance().start(self._connection_worker)
+
+    def _set_realtime_controls_enabled(self, enabled):
+        """Enables or disables starting real-time runs and applying voltages."""
+        self.pushButtonStartRealtime.setEnabled(enabled and not self._realtime_running())
+        self.apply_voltage_button.setEnabled(enabled)
+        for button in self._voltage_steps:
+            button.setEnabled(enabled)
+
     @QtCore.pyqtSlot()
     def on_connect_clicked(self):
-        try:
-            self.keithley.connect()
-            self.update_smu_list()
-            self.update_gui_connection()
-            if not self.keithley.connected:
-                msg = (
-                    f"Keithley无法在{self.keithley.visa_address}地址连接。 "
-                    f"请检查地址是否正确，Keithley设备是否已打开。"
-                )
-                QtWidgets.QMessageBox.information(self, "连接错误", msg)
-        except Exception as e:
+        self._clear_instrument_cache()
+        self.statusBar.showMessage("    Connecting...")
+        self._start_connection_worker(True, self.on_connect_done)
+
+    @QtCore.pyqtSlot(bool, str)
+    def on_connect_done(self, success, error):
+        self._connection_worker = None
+        self._set_realtime_controls_enabled(True)
+
+        if not success:
             self.keithley.connected = False
-            msg = f"连接Keithley设备时出错:\n{str(e)}"
+            msg = f"连接Keithley设备时出错:\n{error}"
+            QtWidgets.QMessageBox.information(self, "连接错误", msg)
+            self.connection_changed_sig.emit()
+            return
+
+        self.update_smu_list()
+        self.connection_changed_sig.emit()
+        if not self.keithley.connected:
+            msg = (
+                f"Keithley无法在{self.keithley.visa_address}地址连接。 "
+                f"请检查地址是否正确，Keithley设备是否已打开。"
+            )
             QtWidgets.QMessageBox.information(self, "连接错误", msg)
-            self.update_gui_connection()
 
     @QtCore.pyqtSlot()
     def on_disconnect_clicked(self):
-        self.keithley.disconnect()
-        self.update_gui_connection()
-        self.statusBar.showMessage("    No Keithley connected.")
+        self._clear_instrument_cache()
+        self._start_connection_worker(False, self.on_disconnect_done)
+
+    @QtCore.pyqtSlot(bool, str)
+    def on_disconnect_done(self, success, error):
+        self._connection_worker = None
+        self._set_realtime_controls_enabled(True)
+        self.connection_changed_sig.emit()
+        if success:
+            self.statusBar.showMessage("    No Keithley connected.")
+        else:
+            self.statusBar.showMessage(f"    断开Keithley设备时出错: {error}")
+
+    @QtCore.pyqtSlot()
+    def on_settings_clicked(self):
+        self.connectionDialog.open()
+
+    @QtCore.pyqtSlot()
+    def on_connection_settings_changed(self):
+        """The connection dialog has reconnected with a new address or library."""
+        self._clear_instrument_cache()
+        self.update_smu_list()
+        self.connection_changed_sig.emit()
 
     @QtCore.pyqtSlot()
     def on_save_clicked(self):
@@ -741,32 +1020,48 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     def on_save_default(self):
         """Saves current settings from GUI as defaults."""
 
-        # save sweep settings
-        self.transfer_sweep_settings.save_defaults()
-        self.output_sweep_settings.save_defaults()
-        self.iv_sweep_settings.save_defaults()
-        self.general_sweep_settings.save_defaults()
+        # write the config file only once for all settings
+        with CONF.transaction():
+            # save sweep settings, tabs which were never shown still hold the defaults
+            for widget in self._sweep_settings_tabs.values():
+                if widget._loaded:
+                    widget.save_defaults()
+            self.general_sweep_settings.save_defaults()
 
-        # save smu specific settings
-        for tab in self.smu_tabs:
-            tab.save_defaults()
+            # save smu specific settings
+            for tab in self.smu_tabs:
+                tab.save_defaults()
 
     @QtCore.pyqtSlot()
     def on_load_default(self):
         """Load default settings to interface."""
 
         # load sweep settings
-        self.transfer_sweep_settings.load_defaults()
-        self.output_sweep_settings.load_defaults()
-        self.iv_sweep_settings.load_defaults()
+        for widget in self._sweep_settings_tabs.values():
+            widget.load_defaults()
+            widget._loaded = True
         self.general_sweep_settings.load_defaults()
 
         # smu settings
         for tab in self.smu_tabs:
             tab.load_defaults()
 
+    @QtCore.pyqtSlot(int)
+    def _lazy_load_tab_defaults(self, index):
+        """Load defaults of a sweep settings tab when it is shown for the first time."""
+        widget = self._sweep_settings_tabs.get(index)
+        if widget is not None and not widget._loaded:
+            widget.load_defaults()
+            widget._loaded = True
+
     @QtCore.pyqtSlot()
     def exit_(self):
+        # stop a running real-time measurement before disconnecting
+        if self.realtime_thread is not None and self.realtime_thread.isRunning():
+            self.realtime_stop_sig.emit()
+            self.realtime_thread.wait()
+        # let pending plot decimation tasks finish before their receiver is deleted
+        QtCore.QThreadPool.globalInstance().waitForDone()
         self.keithley.disconnect()
         self.connection_status_update.stop()
         self.save_geometry()
@@ -778,12 +1073,11 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
     def update_gui_connection(self):
         """Check if Keithley is connected and update GUI."""
+        if self._connection_worker is not None:
+            # connecting or disconnecting, the worker will update the GUI when done
+            return
+
         try:
-            if not hasattr(self.keithley, 'connected'):
-                self.keithley.connected = False
-                self._gui_state_disconnected()
-                return
-                
             if self.keithley.connected:
                 try:
                     test = self.keithley.localnode.model
@@ -797,22 +1091,34 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                     Exception,
                 ):
                     self.keithley.connected = False
-                    self._gui_state_disconnected()
+                    self._set_gui_state(self.STATE_DISCONNECTED)
                 else:
                     if self.keithley.busy:
-                        self._gui_state_busy()
+                        self._set_gui_state(self.STATE_BUSY)
                     else:
-                        self._gui_state_idle()
+                        self._set_gui_state(self.STATE_IDLE)
             else:
-                self._gui_state_disconnected()
+                self._set_gui_state(self.STATE_DISCONNECTED)
         except Exception:
             # 发生任何错误，设置为断开连接状态
-            if hasattr(self.keithley, 'connected'):
-                self.keithley.connected = False
+            self.keithley.connected = False
+            self._set_gui_state(self.STATE_DISCONNECTED)
+
+    def _set_gui_state(self, state):
+        """Switch GUI to the given state, skipped if it is already active."""
+        if state == self._last_conn_state:
+            return
+
+        if state == self.STATE_BUSY:
+            self._gui_state_busy()
+        elif state == self.STATE_IDLE:
+            self._gui_state_idle()
+        else:
             self._gui_state_disconnected()
 
     def _gui_state_busy(self):
         """Set GUI to state for running measurement."""
+        self._last_conn_state = self.STATE_BUSY
 
         self.pushButtonRun.setEnabled(False)
         self.pushButtonAbort.setEnabled(True)
@@ -825,6 +1131,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
     def _gui_state_idle(self):
         """Set GUI to state for IDLE Keithley."""
+        self._last_conn_state = self.STATE_IDLE
 
         self.pushButtonRun.setEnabled(True)
         self.pushButtonAbort.setEnabled(False)
@@ -836,6 +1143,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
     def _gui_state_disconnected(self):
         """ UI changes when keithley is disconnected."""
+        self._last_conn_state = self.STATE_DISCONNECTED
         self.actionConnect.setEnabled(True)
         self.actionDisconnect.setEnabled(False)
         
@@ -846,9 +1154,6 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.pushButtonStartRealtime.setEnabled(True)
         self.pushButtonStopRealtime.setEnabled(False)
         
-        if hasattr(self, 'apply_keithley_settings'):
-            self.apply_keithley_settings.setEnabled(False)
-            
         self.statusBar.showMessage("    No Keithley connected.")
         self.led.setChecked(False)
 
@@ -873,7 +1178,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             # 真实设备模式
             try:
                 # 获取SMU对象
-                smu = getattr(self.keithley, smu_name)
+                smu = self._get_smu(smu_name)
                 
                 # 直接使用SMU对象设置电压，确保输出打开
                 smu.source.func = smu.SOURCE_VOLTAGE  # 设置为电压源模式
@@ -898,11 +1203,22 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             if msg_box.exec_() == QtWidgets.QMessageBox.Cancel:
                 return
         
-        # 创建并启动实时测量线程
-        self.realtime_thread = RealtimeMeasureThread(self.keithley, smu_name, interval, simulation_mode)
-        self.realtime_thread.data_sig.connect(self.on_realtime_data)
-        self.realtime_thread.error_sig.connect(self.on_realtime_error)
-        self.realtime_thread.finished_sig.connect(self.on_realtime_finished)
+        # 创建实时测量工作对象，并将其移至单独的线程
+        self.realtime_thread = QtCore.QThread()
+        self.realtime_worker = RealtimeWorker(self.keithley, smu_name, interval, simulation_mode)
+        self.realtime_worker.moveToThread(self.realtime_thread)
+
+        self.realtime_worker.sample_sig.connect(self.on_realtime_sample)
+        self.realtime_worker.block_sig.connect(self.on_realtime_block)
+        self.realtime_worker.error_sig.connect(self.on_realtime_error)
+        self.realtime_worker.status_sig.connect(self.on_realtime_status)
+        self.realtime_worker.finished_sig.connect(self.on_realtime_finished)
+        # 直接连接：on_stop_realtime_clicked在GUI线程中等待线程结束
+        self.realtime_worker.finished_sig.connect(
+            self.realtime_thread.quit, QtCore.Qt.DirectConnection
+        )
+        self.realtime_stop_sig.connect(self.realtime_worker.stop)
+        self.realtime_thread.started.connect(self.realtime_worker.start)
         
         # 更新UI状态
         self.pushButtonStartRealtime.setEnabled(False)
@@ -910,62 +1226,35 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         
         # 更新导出和清除按钮状态
         # 初始时禁用导出和保存按钮，需要至少有足够数据才能使用
-        if hasattr(self, 'pushButtonSaveRealtime'):
-            self.pushButtonSaveRealtime.setEnabled(False)
-        if hasattr(self, 'pushButtonExportRealtime'):
-            self.pushButtonExportRealtime.setEnabled(False)
-        if hasattr(self, 'pushButtonClearRealtime'):
-            self.pushButtonClearRealtime.setEnabled(True)  # 清除按钮保持启用
+        self.pushButtonSaveRealtime.setEnabled(False)
+        self.pushButtonExportRealtime.setEnabled(False)
+        self.pushButtonClearRealtime.setEnabled(True)  # 清除按钮保持启用
             
         self.realtime_smu.setEnabled(False)
         self.realtime_interval.setEnabled(False)
         
-        # 在测量过程中保持电压控制可用，并添加电压改变时的回调函数
+        # 在测量过程中保持电压控制可用，电压改变时由工作线程应用
         self.realtime_voltage.setEnabled(True)
-        if not hasattr(self, 'voltage_value_changed_connected'):
-            self.realtime_voltage.valueChanged.connect(self.on_voltage_changed)
-            self.voltage_value_changed_connected = True
+        self.realtime_voltage_sig.connect(self.realtime_worker.set_voltage)
         
-        # 清除之前的图表数据
+        # 清除之前的图表和数据
         self.canvas.clear()
+        self.realtime_buffer.clear()
+        self._rt_generation += 1
+        self._rt_pending = False
         
-        # 启动线程
+        # 启动线程和显示刷新定时器
         self.realtime_thread.start()
+        self.realtime_refresh_timer.start()
         
         if simulation_mode:
             self.statusBar.showMessage("    正在进行模拟测量...")
         else:
             self.statusBar.showMessage(f"    正在进行实时测量，电压: {voltage}V")
             
-    @QtCore.pyqtSlot(float)
-    def on_voltage_changed(self, new_voltage):
-        """当电压控制值改变时调用"""
-        if (hasattr(self, 'realtime_thread') and 
-            self.realtime_thread and 
-            self.realtime_thread.isRunning()):
-            
-            simulation_mode = hasattr(self.realtime_thread, 'simulation_mode') and self.realtime_thread.simulation_mode
-            
-            if not simulation_mode and self.keithley.connected:
-                try:
-                    smu_name = self.realtime_smu.currentText()
-                    if smu_name != "--":
-                        smu = getattr(self.keithley, smu_name)
-                        # 应用新电压
-                        self.keithley.apply_voltage(smu, new_voltage)
-                        # 更新状态栏
-                        self.statusBar.showMessage(f"    电压已更新: {new_voltage} V")
-                except Exception as e:
-                    print(f"更新电压时出错: {str(e)}")
-                    self.statusBar.showMessage(f"    电压更新失败: {str(e)}")
-            elif simulation_mode:
-                # 在模拟模式下，更新模拟电压值
-                if hasattr(self.realtime_thread, 'update_simulation_voltage'):
-                    self.realtime_thread.update_simulation_voltage(new_voltage)
-                    self.statusBar.showMessage(f"    模拟电压已更新: {new_voltage} V")
-
     def _reset_realtime_ui(self):
         """重置实时测量UI状态"""
+        self._rt_line = None
         self.pushButtonStartRealtime.setEnabled(True)
         self.pushButtonStopRealtime.setEnabled(False)
         self.realtime_smu.setEnabled(True)
@@ -975,37 +1264,44 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     @QtCore.pyqtSlot()
     def on_stop_realtime_clicked(self):
         """停止实时测量"""
-        if hasattr(self, 'realtime_thread') and self.realtime_thread.isRunning():
-            # 停止线程
-            self.realtime_thread.running = False
-            self.realtime_thread.wait()  # 等待线程终止
+        if self.realtime_thread is not None and self.realtime_thread.isRunning():
+            # 先发送尚未应用的电压，再停止工作对象，并等待线程终止
+            if self._voltage_timer.isActive():
+                self._voltage_timer.stop()
+                self._apply_pending_voltage()
+            self.realtime_stop_sig.emit()
+            self.realtime_thread.wait()
             
             # 更新UI状态
             self.pushButtonStartRealtime.setEnabled(True)
             self.pushButtonStopRealtime.setEnabled(False)
             
             # 禁用保存和清除按钮，但保持导出按钮可用（允许导出已收集的数据）
-            if hasattr(self, 'pushButtonSaveRealtime'):
-                self.pushButtonSaveRealtime.setEnabled(False)
-            if hasattr(self, 'pushButtonClearRealtime'):
-                self.pushButtonClearRealtime.setEnabled(True)  # 保持可用以清除图表
+            self.pushButtonSaveRealtime.setEnabled(False)
+            self.pushButtonClearRealtime.setEnabled(True)  # 保持可用以清除图表
             
             self.realtime_smu.setEnabled(True)
             self.realtime_interval.setEnabled(True)
             
-            # 断开电压改变时的回调函数
-            if hasattr(self, 'voltage_value_changed_connected'):
-                try:
-                    self.realtime_voltage.valueChanged.disconnect(self.on_voltage_changed)
-                except TypeError:
-                    pass  # 如果没有连接，则会引发TypeError
-                self.voltage_value_changed_connected = False
-            
             self.statusBar.showMessage("    实时测量已停止")
             
+    @QtCore.pyqtSlot(object)
+    def on_realtime_error(self, exc):
+        """实时测量出错时的处理"""
+        self.statusBar.showMessage(f"    实时测量出错: {str(exc)}")
+        QtWidgets.QMessageBox.information(
+            self, "测量错误", f"{exc.__class__.__name__}: {str(exc)}"
+        )
+
     @QtCore.pyqtSlot()
     def on_realtime_finished(self):
         """实时测量结束后的处理"""
+        # 停止刷新定时器，并显示最后的数据
+        self.realtime_refresh_timer.stop()
+        self.on_realtime_refresh()
+        # 丢弃尚未显示的状态消息
+        self._status_timer.stop()
+        self._pending_status = None
         try:
             self.statusBar.showMessage("    实时测量已结束")
             
@@ -1014,43 +1310,34 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             self.pushButtonStopRealtime.setEnabled(False)
             
             # 根据是否有数据来设置导出和保存按钮状态
-            has_data = (hasattr(self, 'realtime_thread') and 
-                       hasattr(self.realtime_thread, 'time_data') and 
-                       len(self.realtime_thread.time_data) >= 5)
+            has_data = len(self.realtime_buffer) >= 5
                        
-            if hasattr(self, 'pushButtonSaveRealtime'):
-                self.pushButtonSaveRealtime.setEnabled(has_data)
-            if hasattr(self, 'pushButtonExportRealtime'):
-                self.pushButtonExportRealtime.setEnabled(has_data)
-            if hasattr(self, 'pushButtonClearRealtime'):
-                self.pushButtonClearRealtime.setEnabled(has_data)
+            self.pushButtonSaveRealtime.setEnabled(has_data)
+            self.pushButtonExportRealtime.setEnabled(has_data)
+            self.pushButtonClearRealtime.setEnabled(has_data)
             
             self.realtime_smu.setEnabled(True)
             self.realtime_interval.setEnabled(True)
             
             # 检查是否需要关闭设备输出
-            if (hasattr(self, 'realtime_thread') and 
-                hasattr(self.realtime_thread, 'simulation_mode') and 
-                not self.realtime_thread.simulation_mode):
+            if (self.realtime_worker is not None and
+                    not self.realtime_worker.simulation_mode):
                 
                 # 只在实际设备模式下关闭输出
-                if hasattr(self, 'keithley') and hasattr(self.keithley, 'connected') and self.keithley.connected:
+                if self.keithley.connected:
                     try:
-                        smu_name = self.realtime_smu.currentText()
-                        if smu_name != "--":
-                            smu = getattr(self.keithley, smu_name)
+                        smu = self.realtime_worker.smu
+                        if smu is not None:
                             smu.source.output = smu.OUTPUT_OFF
-                            print(f"已关闭 {smu_name} 的输出")
+                            print(f"已关闭 {self.realtime_worker.smu_name} 的输出")
                     except Exception as e:
                         print(f"关闭输出时出错: {str(e)}")
                         
             # 断开电压改变时的回调函数
-            if hasattr(self, 'voltage_value_changed_connected') and self.voltage_value_changed_connected:
-                try:
-                    self.realtime_voltage.valueChanged.disconnect(self.on_voltage_changed)
-                except TypeError:
-                    pass  # 如果没有连接，则会引发TypeError
-                self.voltage_value_changed_connected = False
+            try:
+                self.realtime_voltage_sig.disconnect(self.realtime_worker.set_voltage)
+            except TypeError:
+                pass  # 如果没有连接，则会引发TypeError
                 
         except Exception as e:
             print(f"实时测量结束处理时出错: {str(e)}")
@@ -1064,19 +1351,49 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             except:
                 pass
 
+    @QtCore.pyqtSlot(str)
+    def on_realtime_status(self, message):
+        """显示测量线程的状态消息，距上次显示不足250 ms时延后显示"""
+        if self._status_timer.isActive():
+            self._pending_status = message
+        else:
+            self.statusBar.showMessage(message)
+            self._status_timer.start()
+
+    @QtCore.pyqtSlot()
+    def _show_pending_status(self):
+        if self._pending_status is not None:
+            self.statusBar.showMessage(self._pending_status)
+            self._pending_status = None
+            self._status_timer.start()
+
+    @QtCore.pyqtSlot(float)
+    def on_realtime_voltage_changed(self, new_voltage):
+        """电压框的值改变时重新开始计时，计时结束后才应用电压"""
+        self._voltage_timer.start()
+
+    @QtCore.pyqtSlot()
+    def _apply_pending_voltage(self):
+        """将电压框当前的值发送给实时测量线程"""
+        self.realtime_voltage_sig.emit(self.realtime_voltage.value())
+
     @QtCore.pyqtSlot()
     def on_voltage_editing_finished(self):
-        """当电压编辑完成时调用"""
-        if hasattr(self, 'realtime_thread') and self.realtime_thread:
-            # 获取编辑后的电压值
-            new_voltage = self.realtime_voltage.value()
-            # 应用电压
+        """当电压编辑完成时调用，测量进行中电压框的变化已通知工作线程"""
+        if self.realtime_thread is not None and not self._realtime_running():
             self.on_apply_voltage_clicked()
 
+    def _realtime_running(self):
+        return self.realtime_thread is not None and self.realtime_thread.isRunning()
+
     @QtCore.pyqtSlot()
     def on_apply_voltage_clicked(self):
         """当应用电压按钮被点击时调用"""
-        if hasattr(self, 'realtime_thread') and self.realtime_thread:
+        if self._realtime_running():
+            # 测量进行中由工作线程应用电压，立即发送而不等待计时结束
+            self._voltage_timer.stop()
+            self._apply_pending_voltage()
+        elif self.realtime_thread is not None:
             # 获取选择的SMU和电压值
             smu_name = self.realtime_smu.currentText()
             new_voltage = self.realtime_voltage.value()
@@ -1094,7 +1411,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                 # 真实设备模式
                 try:
                     # 应用电压
-                    smu = getattr(self.keithley, smu_name)
+                    smu = self._get_smu(smu_name)
                     self.keithley.apply_voltage(smu, new_voltage)
                 except Exception as e:
                     QtWidgets.QMessageBox.information(
@@ -1116,59 +1433,45 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             self.statusBar.showMessage(f"    电压已更新: {new_voltage} V")
 
     @QtCore.pyqtSlot()
-    def on_voltage_up_clicked(self):
-        """增加电压1V"""
-        current_value = self.realtime_voltage.value()
-        self.realtime_voltage.setValue(current_value + 1.0)
-        # 自动应用电压
-        self.on_apply_voltage_clicked()
-        
-    @QtCore.pyqtSlot()
-    def on_voltage_down_clicked(self):
-        """减少电压1V"""
-        current_value = self.realtime_voltage.value()
-        self.realtime_voltage.setValue(current_value - 1.0)
-        # 自动应用电压
-        self.on_apply_voltage_clicked()
-        
-    @QtCore.pyqtSlot()
-    def on_voltage_zero_clicked(self):
-        """将电压设为0V"""
-        self.realtime_voltage.setValue(0.0)
-        # 自动应用电压
-        self.on_apply_voltage_clicked()
-        
-    @QtCore.pyqtSlot()
-    def on_voltage_up_small_clicked(self):
-        """增加电压0.1V"""
-        current_value = self.realtime_voltage.value()
-        self.realtime_voltage.setValue(current_value + 0.1)
-        # 自动应用电压
-        self.on_apply_voltage_clicked()
-        
-    @QtCore.pyqtSlot()
-    def on_voltage_down_small_clicked(self):
-        """减少电压0.1V"""
-        current_value = self.realtime_voltage.value()
-        self.realtime_voltage.setValue(current_value - 0.1)
-        # 自动应用电压
-        self.on_apply_voltage_clicked()
+    def on_voltage_step_clicked(self):
+        """电压步进按钮被点击时调用，记录步进值并在下一个事件循环周期应用"""
+        step = self._voltage_steps[self.sender()]
+        if step is None:
+            self._pending_zero = True
+            self._pending_dv = 0.0
+        else:
+            self._pending_dv += step
+
+        if not self._dv_scheduled:
+            self._dv_scheduled = True
+            QtCore.QTimer.singleShot(0, self._apply_pending_dv)
+
+    def _apply_pending_dv(self):
+        """将累计的电压步进一次性写入电压框并应用"""
+        base = 0.0 if self._pending_zero else self.realtime_voltage.value()
+        self.realtime_voltage.setValue(base + self._pending_dv)
+
+        self._pending_dv = 0.0
+        self._pending_zero = False
+        self._dv_scheduled = False
+
+        # 测量进行中电压框的变化已通知工作线程，否则直接应用电压
+        if not self._realtime_running():
+            self.on_apply_voltage_clicked()
 
     @QtCore.pyqtSlot()
     def on_export_realtime_clicked(self):
         """导出当前实时测量数据图表"""
-        if not (self.realtime_thread and hasattr(self.realtime_thread, 'time_data')):
+        if len(self.realtime_buffer) == 0:
             QtWidgets.QMessageBox.information(
                 self, "导出错误", "没有可导出的实时测量数据"
             )
             return
             
         # 获取实时测量数据
-        time_data = self.realtime_thread.time_data
-        voltage_data = self.realtime_thread.voltage_data
-        current_data = self.realtime_thread.current_data
+        time_data, voltage_data, current_data = self.realtime_buffer.snapshot()
         
-        if not time_data or len(time_data) < 2:
+        if len(time_data) < 2:
             QtWidgets.QMessageBox.information(
                 self, "导出错误", "没有足够的测量数据可导出"
             )
@@ -1180,11 +1483,8 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         timestamp = now.strftime("%Y%m%d_%H%M%S")
         
         # 获取当前电压值
-        if hasattr(self, 'realtime_voltage'):
-            voltage = self.realtime_voltage.value()
-            default_filename = f"realtime_v{voltage}V_{timestamp}"
-        else:
-            default_filename = f"realtime_data_{timestamp}"
+        voltage = self.realtime_voltage.value()
+        default_filename = f"realtime_v{voltage}V_{timestamp}"
         
         # 展示保存格式选择对话框
         format_dialog = QtWidgets.QMessageBox()
@@ -1231,7 +1531,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                 # 导出为TXT文件
                 with open(filepath, 'w') as f:
                     # 写入标题行
-                    current_voltage = self.realtime_voltage.value() if hasattr(self, 'realtime_voltage') else "未知"
+                    current_voltage = self.realtime_voltage.value()
                     f.write("# 实时测量数据导出\n")
                     f.write(f"# 导出时间: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
                     f.write(f"# 设定电压: {current_voltage}V\n")
@@ -1244,7 +1544,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                 # 导出为CSV文件
                 with open(filepath, 'w') as f:
                     # 写入元数据
-                    current_voltage = self.realtime_voltage.value() if hasattr(self, 'realtime_voltage') else "未知"
+                    current_voltage = self.realtime_voltage.value()
                     f.write(f"# 实时测量数据导出,\n")
                     f.write(f"# 导出时间:,{now.strftime('%Y-%m-%d %H:%M:%S')},\n")
                     f.write(f"# 设定电压:,{current_voltage}V,\n")
@@ -1277,7 +1577,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                         worksheet = writer.sheets['测量数据']
                         
                         # 添加元数据行
-                        current_voltage = self.realtime_voltage.value() if hasattr(self, 'realtime_voltage') else "未知"
+                        current_voltage = self.realtime_voltage.value()
                         metadata = [
                             ["实时测量数据导出"],
                             [f"导出时间: {now.strftime('%Y-%m-%d %H:%M:%S')}"],
@@ -1302,7 +1602,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                     # 改为导出CSV格式
                     with open(filepath.replace(".xlsx", ".csv"), 'w') as f:
                         # 写入元数据
-                        current_voltage = self.realtime_voltage.value() if hasattr(self, 'realtime_voltage') else "未知"
+                        current_voltage = self.realtime_voltage.value()
                         f.write(f"# 实时测量数据导出,\n")
                         f.write(f"# 导出时间:,{now.strftime('%Y-%m-%d %H:%M:%S')},\n")
                         f.write(f"# 设定电压:,{current_voltage}V,\n")
@@ -1353,7 +1653,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     def on_clear_realtime_clicked(self):
         """清除实时测量图表并重新开始收集数据"""
         # 检查是否有正在运行的实时测量线程
-        if not hasattr(self, 'realtime_thread') or not self.realtime_thread:
+        if self.realtime_thread is None:
             QtWidgets.QMessageBox.information(
                 self, "清除错误", "没有实时测量线程"
             )
@@ -1365,18 +1665,17 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             self.canvas.clear()
             
             # 清除测量线程中的数据历史
-            self.realtime_thread.time_data = []
-            self.realtime_thread.voltage_data = []
-            self.realtime_thread.current_data = []
+            self.realtime_buffer.clear()
+            self._rt_generation += 1
             
             # 重置起始时间为当前时间
-            self.realtime_thread.start_time = time.time()
+            self.realtime_worker.start_ns = time.perf_counter_ns()
             
             # 更新状态栏
             self.statusBar.showMessage("    图表已清除，继续测量中...")
         else:
             # 如果线程不在运行但存在数据，询问是否清除
-            if hasattr(self.realtime_thread, 'time_data') and self.realtime_thread.time_data:
+            if len(self.realtime_buffer) > 0:
                 msg_box = QtWidgets.QMessageBox()
                 msg_box.setIcon(QtWidgets.QMessageBox.Question)
                 msg_box.setWindowTitle("清除确认")
@@ -1388,9 +1687,8 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
                     self.canvas.clear()
                     
                     # 清除历史数据
-                    self.realtime_thread.time_data = []
-                    self.realtime_thread.voltage_data = []
-                    self.realtime_thread.current_data = []
+                    self.realtime_buffer.clear()
+                    self._rt_generation += 1
                     
                     # 更新状态栏
                     self.statusBar.showMessage("    图表和历史数据已清除")
@@ -1403,85 +1701,138 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
     def _on_realtime_data_reset(self):
         """重置实时测量数据后的处理"""
         # 更新UI状态
-        if hasattr(self, 'pushButtonStartRealtime'):
-            self.pushButtonStartRealtime.setEnabled(False)
-        if hasattr(self, 'pushButtonStopRealtime'):
-            self.pushButtonStopRealtime.setEnabled(True)
-        if hasattr(self, 'pushButtonClearRealtime'):
-            self.pushButtonClearRealtime.setEnabled(True)
-        if hasattr(self, 'pushButtonSaveRealtime'):
-            self.pushButtonSaveRealtime.setEnabled(False)  # 刚刚清除后，暂时禁用保存按钮
-        if hasattr(self, 'pushButtonExportRealtime'):
-            self.pushButtonExportRealtime.setEnabled(False)  # 刚刚清除后，暂时禁用导出按钮
+        self.pushButtonStartRealtime.setEnabled(False)
+        self.pushButtonStopRealtime.setEnabled(True)
+        self.pushButtonClearRealtime.setEnabled(True)
+        self.pushButtonSaveRealtime.setEnabled(False)  # 刚刚清除后，暂时禁用保存按钮
+        self.pushButtonExportRealtime.setEnabled(False)  # 刚刚清除后，暂时禁用导出按钮
             
         # 重新启用当数据积累到一定量时
         QtCore.QTimer.singleShot(2000, self._enable_data_functions)
 
+    def _update_realtime_labels(self, t, v, i):
+        """更新实时数值标签，仅在显示值改变时重新格式化和设置文本"""
+        # 按显示精度取整后比较，电流以科学计数法显示（7位有效数字），按有效数字取整
+        if i and math.isfinite(i):
+            i = round(i, 6 - math.floor(math.log10(abs(i))))
+        values = (round(t, 2), round(v, 6), i)
+        last = self._last_label_values
+        if values == last:
+            return
+
+        labels = (
+            (self.realtime_time_label, "{:.2f} s"),
+            (self.realtime_voltage_label, "{:.6f} V"),
+            (self.realtime_current_label, "{:.6e} A"),
+        )
+        for k, (label, fmt) in enumerate(labels):
+            if last is None or values[k] != last[k]:
+                label.setText(fmt.format(values[k]))
+
+        self._last_label_values = values
+
+    @QtCore.pyqtSlot(float, float, float)
+    def on_realtime_sample(self, t, v, i):
+        """记录测量线程发送的单个测量值"""
+        self.realtime_buffer.append(t, v, i)
+        self._rt_latest = (t, v, i)
+        self._rt_pending = True
+
     @QtCore.pyqtSlot(object)
+    def on_realtime_block(self, block):
+        """记录测量线程发送的一组测量值"""
+        self.realtime_buffer.extend(block)
+        self._rt_latest = tuple(block[:, -1])
+        self._rt_pending = True
+
+    @QtCore.pyqtSlot()
+    def on_realtime_refresh(self):
+        """刷新实时数据显示，自上次刷新后没有新数据时不重绘"""
+        if not self._rt_pending:
+            return
+        self._rt_pending = False
+
+        data = self._rt_snapshot
+        data["time"], data["voltage"], data["current"] = self.realtime_buffer.snapshot()
+        data["last_value"] = self._rt_latest
+        self.on_realtime_data(data)
+        if self.realtime_worker is not None:
+            self.realtime_worker.paint_done()
+
     def on_realtime_data(self, data):
         """处理实时测量数据"""
         try:
             # 更新界面显示的实时值
             t, v, i = data["last_value"]
-            self.realtime_time_label.setText(f"{t:.2f} s")
-            self.realtime_voltage_label.setText(f"{v:.6f} V")
-            self.realtime_current_label.setText(f"{i:.6e} A")
+            self._update_realtime_labels(t, v, i)
             
             # 更新图表
             if len(data["time"]) > 1:  # 至少有两个点才能画图
-                # 限制数据点数量，避免内存问题
-                max_points = 1000  # 最大数据点数
-                if len(data["time"]) > max_points:
-                    # 只保留最新的max_points个点
-                    plot_time = data["time"][-max_points:]
-                    plot_current = data["current"][-max_points:]
+                # 上次抽取尚未完成时，完成后再用最新数据重新抽取
+                if self._render_in_flight:
+                    self._render_again = True
                 else:
-                    plot_time = data["time"]
-                    plot_current = data["current"]
-                
-                try:
-                    # 绘制时间-电流曲线
-                    self.canvas.clear()
-                    self.canvas.plot_xy(plot_time, plot_current, "时间 (s)", "电流 (A)", f"实时电流 (V={v:.2f}V)")
-                    
-                    # 强制更新画布
-                    QtWidgets.QApplication.processEvents()
-                    
-                    # 数据足够时启用保存和导出按钮
-                    if len(data["time"]) >= 5:  # 至少有5个数据点才启用
-                        if hasattr(self, 'pushButtonSaveRealtime'):
-                            self.pushButtonSaveRealtime.setEnabled(True)
-                        if hasattr(self, 'pushButtonExportRealtime'):
-                            self.pushButtonExportRealtime.setEnabled(True)
-                        if hasattr(self, 'pushButtonClearRealtime'):
-                            self.pushButtonClearRealtime.setEnabled(True)
-                    
-                except Exception as plot_error:
-                    print(f"绘图出错: {str(plot_error)}")
-                    # 尝试重建画布
-                    try:
-                        self.canvas.clear()
-                        QtWidgets.QApplication.processEvents()
-                    except:
-                        pass
+                    self._start_render(data["time"], data["current"])
+
+                # 数据足够时启用保存和导出按钮
+                if len(data["time"]) >= 5:  # 至少有5个数据点才启用
+                    self.pushButtonSaveRealtime.setEnabled(True)
+                    self.pushButtonExportRealtime.setEnabled(True)
+                    self.pushButtonClearRealtime.setEnabled(True)
         except Exception as e:
             print(f"处理实时数据时出错: {str(e)}")
+
+    def _start_render(self, time_data, current_data):
+        """在线程池中抽取绘图数据，完成后由on_realtime_rendered绘制"""
+        self._render_in_flight = True
+        task = DecimateTask(
+            self._render_signals, self._rt_generation, time_data, current_data,
+            self.REALTIME_MAX_PLOT_POINTS,
+        )
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    @QtCore.pyqtSlot(int, object, object)
+    def on_realtime_rendered(self, generation, plot_time, plot_current):
+        """用抽取后的数据更新实时电流曲线"""
+        self._render_in_flight = False
+
+        if generation == self._rt_generation and plot_time is not None:
+            try:
+                # 绘制时间-电流曲线，曲线已存在时只更新数据
+                title = f"实时电流 (V={self._rt_latest[1]:.2f}V)"
+                if (self._rt_line is None
+                        or self._rt_line not in self.canvas.p.listDataItems()):
+                    self._rt_line = self.canvas.init_line(
+                        "时间 (s)", "电流 (A)", title
+                    )
+                elif title != self._rt_title:
+                    self.canvas.setTitle(title)
+                self._rt_title = title
+                self.canvas.update_line(plot_time, plot_current)
+            except Exception as plot_error:
+                print(f"绘图出错: {str(plot_error)}")
+                # 尝试重建画布
+                try:
+                    self.canvas.clear()
+                except Exception:
+                    pass
+
+        if self._render_again:
+            self._render_again = False
+            time_data, _, current_data = self.realtime_buffer.snapshot()
+            if len(time_data) > 1:
+                self._start_render(time_data, current_data)
             
     def _enable_data_functions(self):
         """启用数据相关功能按钮"""
         # 只有当有足够的数据时才启用
-        if (hasattr(self, 'realtime_thread') and 
-            hasattr(self.realtime_thread, 'time_data') and 
-            len(self.realtime_thread.time_data) >= 5):
+        if len(self.realtime_buffer) >= 5:
             
-            if hasattr(self, 'pushButtonSaveRealtime'):
-                self.pushButtonSaveRealtime.setEnabled(True)
-            if hasattr(self, 'pushButtonExportRealtime'):
-                self.pushButtonExportRealtime.setEnabled(True)
+            self.pushButtonSaveRealtime.setEnabled(True)
+            self.pushButtonExportRealtime.setEnabled(True)
                 
         # 清除按钮总是可用
-        if hasattr(self, 'pushButtonClearRealtime'):
-            self.pushButtonClearRealtime.setEnabled(True)
+        self.pushButtonClearRealtime.setEnabled(True)
 
 
 # noinspection PyUnresolvedReferences
@@ -1532,14 +1883,20 @@ class MeasureThread(QtCore.QThread):
                 )
 
             elif self.params["sweep_type"] == "iv":
-                direction = np.sign(self.params["VStop"] - self.params["VStart"])
-                stp = direction * abs(self.params["VStep"])
+                v_start = self.params["VStart"]
+                v_stop = self.params["VStop"]
+                v_step = abs(self.params["VStep"])
+                if v_stop == v_start:
+                    n_steps = 0
+                elif v_step:
+                    # at least one step so that the sweep reaches VStop
+                    n_steps = max(1, int(round(abs(v_stop - v_start) / v_step)))
+                else:
+                    n_steps = 1
 
-                # forward and reverse sweeps
-                sweeplist = np.arange(
-                    self.params["VStart"], self.params["VStop"] + stp, stp
-                )
-                sweeplist = np.append(sweeplist, np.flip(sweeplist))
+                # forward and reverse sweeps, linspace always includes both end points
+                fwd = np.linspace(v_start, v_stop, n_steps + 1)
+                sweeplist = np.concatenate((fwd, fwd[::-1]))
 
                 v, i = self.keithley.voltage_sweep_single_smu(
                     self.params["smu_sweep"],
@@ -1559,7 +1916,9 @@ class MeasureThread(QtCore.QThread):
                 sweep_data = FETResultTable(
                     column_titles=["Voltage", "Current"],
                     units=["V", "A"],
-                    data=np.array([v, i]).transpose(),
+                    data=np.column_stack(
+                        (np.asarray(v, dtype=np.float64), np.asarray(i, dtype=np.float64))
+                    ),
                     params=params,
                 )
 
@@ -1571,205 +1930,406 @@ class MeasureThread(QtCore.QThread):
             self.error_sig.emit(exc)
 
 
+class ConnectionSignals(QtCore.QObject):
+
+    finished_sig = QtCore.pyqtSignal(bool, str)
+
+
+class ConnectionWorker(QtCore.QRunnable):
+    """Runs a blocking connect or disconnect of the Keithley off the GUI thread."""
+
+    def __init__(self, keithley, connect=True):
+        QtCore.QRunnable.__init__(self)
+        self.keithley = keithley
+        self.connecting = connect
+        # signals are queued to the GUI thread, keep the worker alive until then
+        self.signals = ConnectionSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            if self.connecting:
+                self.keithley.connect()
+            else:
+                self.keithley.disconnect()
+        except Exception as exc:
+            self.signals.finished_sig.emit(False, str(exc))
+        else:
+            self.signals.finished_sig.emit(True, "")
+
+
 # 实时测量线程
-class RealtimeMeasureThread(QtCore.QThread):
-    data_sig = QtCore.pyqtSignal(object)
+class SampleBuffer(object):
+    """
+    Growable float64 storage for (time, voltage, current) samples. Appending is
+    amortised O(1): the capacity is doubled when full instead of growing per sample.
+    The buffer is owned by the GUI thread and is not thread-safe.
+    """
+
+    def __init__(self, capacity=1024):
+        self._data = np.empty((3, capacity), dtype=np.float64)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self):
+        data = np.empty((3, 2 * self._data.shape[1]), dtype=np.float64)
+        data[:, : self._n] = self._data[:, : self._n]
+        self._data = data
+
+    def append(self, t, v, i):
+        if self._n == self._data.shape[1]:
+            self._grow()
+        self._data[:, self._n] = (t, v, i)
+        self._n += 1
+
+    def extend(self, block):
+        """Appends a (3, N) array of time, voltage and current samples."""
+        n_new = block.shape[1]
+        while self._n + n_new > self._data.shape[1]:
+            self._grow()
+        end = self._n + n_new
+        self._data[:, self._n : end] = block
+        self._n = end
+
+    def clear(self):
+        self._n = 0
+
+    def snapshot(self):
+        """Returns views of the recorded time, voltage and current arrays."""
+        return tuple(self._data[:, : self._n])
+
+
+class RenderSignals(QtCore.QObject):
+    """Signals of :class:`DecimateTask`, QRunnable itself cannot emit signals."""
+
+    # generation, decimated time and current arrays (None on error)
+    done_sig = QtCore.pyqtSignal(int, object, object)
+
+
+class DecimateTask(QtCore.QRunnable):
+    """
+    Decimates real-time data for plotting in a thread pool. The arrays are only read,
+    results are reported through ``signals.done_sig``.
+    """
+
+    def __init__(self, signals, generation, time_data, current_data, max_points):
+        QtCore.QRunnable.__init__(self)
+        self.signals = signals
+        self.generation = generation
+        self.time_data = time_data
+        self.current_data = current_data
+        self.max_points = max_points
+
+    def run(self):
+        try:
+            x, y = _minmax_decimate(self.time_data, self.current_data, self.max_points)
+        except Exception as e:
+            logger.warning("抽取绘图数据时出错: %s", e)
+            x = y = None
+        self.signals.done_sig.emit(self.generation, x, y)
+
+
+class RealtimeWorker(QtCore.QObject):
+    """
+    实时测量工作对象，通过moveToThread在单独的线程中运行。测量节奏由该线程中的
+    单次QTimer控制，每次按固定的截止时间重新计算等待时长，因此不会累积时间误差。
+    电压更新和停止请求通过排队的信号槽调用在工作线程中依次执行。
+    """
+
+    # 单个测量值 (t, v, i)
+    sample_sig = QtCore.pyqtSignal(float, float, float)
+    # 一组测量值，形状为(3, N)的数组，依次为时间、电压和电流
+    block_sig = QtCore.pyqtSignal(object)
     error_sig = QtCore.pyqtSignal(object)
     finished_sig = QtCore.pyqtSignal()
+    status_sig = QtCore.pyqtSignal(str)
+
+    # 最大连续错误次数
+    MAX_CONSECUTIVE_ERRORS = 3
 
     def __init__(self, keithley, smu_name, interval=0.5, simulation_mode=False):
-        QtCore.QThread.__init__(self)
+        QtCore.QObject.__init__(self)
         self.keithley = keithley
         self.smu_name = smu_name
         try:
             self.smu = getattr(self.keithley, smu_name)
         except Exception as e:
-            print(f"获取SMU对象时出错: {str(e)}")
+            logger.warning("获取SMU对象时出错: %s", e)
             self.smu = None
         self.interval = interval  # 数据更新间隔（秒）
-        self.running = True
-        self.time_data = []
-        self.voltage_data = []
-        self.current_data = []
-        self.start_time = 0
+        self.running = False
+        # 测量开始的时间（纳秒），测量值的时间为与之相差的秒数
+        self.start_ns = 0
         self.simulation_mode = simulation_mode
-        
+
         # 动态电压值，可在测量过程中更新
         self.current_voltage = 1.0
-        # 线程锁，防止电压更新和读取之间的竞争条件
-        self.lock = QtCore.QMutex()
 
-    def __del__(self):
-        self.running = False
-        self.wait()
+        self._timer = None
+        self._finished = False
+        self._consecutive_errors = 0
+        # 读取电压和电流的方法，首次测量时确定
+        self._read_vi = None
+        # 上次发送的数据尚未被GUI绘制时被设置，此时新数据暂存在_backlog中。
+        # 只由测量线程设置、GUI线程清除，因此检查和设置之间无需加锁
+        self._paint_pending = threading.Event()
+        self._backlog = []
+        # 通信超时后的恢复：下次测量前暂停的时间（秒）以及是否需要先重置设备。
+        # 暂停通过定时器实现，因此期间仍能及时处理停止请求
+        self._hold_off = 0
+        self._reset_pending = False
+
+    @QtCore.pyqtSlot(float)
+    def set_voltage(self, new_voltage):
+        """在测量过程中更新电压，与测量在同一线程中执行"""
+        if self.simulation_mode:
+            self.current_voltage = new_voltage
+            self.status_sig.emit(f"    模拟电压已更新: {new_voltage} V")
+            return
+
+        try:
+            self.keithley.apply_voltage(self.smu, new_voltage)
+            self.status_sig.emit(f"    电压已更新: {new_voltage} V")
+        except Exception as e:
+            logger.warning("更新电压时出错: %s", e)
+            self.status_sig.emit(f"    电压更新失败: {str(e)}")
+
+    @QtCore.pyqtSlot()
+    def start(self):
+        """开始测量，在工作线程启动后调用"""
+        try:
+            if not self.simulation_mode:
+                # 检查设备是否已连接
+                if not self.keithley.connected:
+                    raise Exception("设备未连接")
 
+                # 检查SMU是否有效
+                if self.smu is None:
+                    raise Exception("无法获取SMU对象")
+
+            self.start_ns = time.perf_counter_ns()
+            self._consecutive_errors = 0
+            self.running = True
+
+            self._period = self.interval
+            self._deadline = time.monotonic()
+            self._timer = QtCore.QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+            self._timer.timeout.connect(self._tick)
+
+            # 立即进行第一次测量
+            self._tick()
+
+        except Exception as exc:
+            self.error_sig.emit(exc)
+            self.stop()
+
+    @QtCore.pyqtSlot()
     def stop(self):
+        """停止测量并恢复设备设置"""
+        if self._finished:
+            return
+        self._finished = True
         self.running = False
-        
-    def update_simulation_voltage(self, new_voltage):
-        """更新模拟模式下的电压值"""
-        self.lock.lock()
-        self.current_voltage = new_voltage
-        self.lock.unlock()
-        
-    def _run_simulation(self):
-        """在模拟模式下生成随机数据"""
-        import random
-        import math
-        
-        self.time_data = []
-        self.voltage_data = []
-        self.current_data = []
-        self.start_time = time.time()
-        
+
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer.deleteLater()
+            self._timer = None
+
+        # 发送暂存的数据，确保不丢失
+        if self._backlog:
+            self.block_sig.emit(np.concatenate(self._backlog, axis=1))
+            self._backlog = []
+
+        self.finished_sig.emit()
+
+    def paint_done(self):
+        """由GUI线程在绘制完已接收的数据后调用，允许发送新的数据"""
+        self._paint_pending.clear()
+
+    def _deliver(self, block):
+        """
+        将形状为(3, N)的数据发送给GUI。上次发送的数据尚未绘制时只暂存，
+        在GUI跟不上时避免事件队列不断增长。
+        """
+        if not self._paint_pending.is_set():
+            self._paint_pending.set()
+            if self._backlog:
+                self._backlog.append(block)
+                block = np.concatenate(self._backlog, axis=1)
+                self._backlog = []
+            self.block_sig.emit(block)
+        else:
+            self._backlog.append(block)
+
+    def _deliver_sample(self, t, v, i):
+        """与_deliver相同，但用于单个测量值"""
+        if self._backlog or self._paint_pending.is_set():
+            self._deliver(np.array(((t,), (v,), (i,))))
+        else:
+            self._paint_pending.set()
+            self.sample_sig.emit(t, v, i)
+
+    @QtCore.pyqtSlot()
+    def _tick(self):
+        if not self.running:
+            return
+        if self._reset_pending:
+            self._reset_device()
+        elif self.simulation_mode:
+            self._simulate()
+        else:
+            self._measure()
+
+        if self._timer is not None:
+            self._schedule_next()
+
+    def _schedule_next(self):
+        """按截止时间安排下一次测量，落后时立即测量且不追赶错过的周期"""
+        if self._hold_off:
+            # 恢复过程中暂停，之后重新按截止时间计时
+            self._deadline = time.monotonic() + self._hold_off
+            self._timer.start(int(self._hold_off * 1000))
+            self._hold_off = 0
+            return
+
+        self._deadline += self._period
+        delay = self._deadline - time.monotonic()
+        if delay < 0:
+            self._deadline -= delay
+            delay = 0
+        self._timer.start(int(delay * 1000))
+
+    def _simulate(self):
+        """在模拟模式下生成一个随机测量值"""
         # 模拟参数
         frequency = 0.2  # 波动频率
         noise_level = 0.1  # 噪声水平
         baseline = 1e-6   # 基准电流值
         amplitude = 1e-6  # 波动幅度
-        
-        t = 0
-        while self.running:
-            # 获取当前电压值（使用锁防止竞态条件）
-            self.lock.lock()
-            simulated_voltage = self.current_voltage
-            self.lock.unlock()
-            
-            # 电流随电压近似线性变化（欧姆定律模拟）的简化模型
-            current_scale = abs(simulated_voltage) * 2e-6
-            
-            # 随机模拟电流值，包含一些周期性变化和噪声
-            # 简单的正弦波加上随机噪声
-            sine_component = amplitude * math.sin(2 * math.pi * frequency * t)
-            noise = random.uniform(-noise_level, noise_level) * amplitude
-            i = baseline + current_scale + sine_component + noise
-            
-            self.time_data.append(t)
-            self.voltage_data.append(simulated_voltage)
-            self.current_data.append(i)
-            
-            # 发送数据到主线程
-            data = {
-                "time": self.time_data,
-                "voltage": self.voltage_data,
-                "current": self.current_data,
-                "last_value": (t, simulated_voltage, i)
-            }
-            self.data_sig.emit(data)
-            
-            # 等待指定间隔
-            time.sleep(self.interval)
-            t += self.interval
 
-    def run(self):
-        try:
-            # 检查是否为模拟模式
-            if self.simulation_mode:
-                self._run_simulation()
-                return
-                
-            # 以下是实际设备模式
-            # 检查设备是否已连接
-            if not hasattr(self.keithley, 'connected') or not self.keithley.connected:
-                self.error_sig.emit(Exception("设备未连接"))
-                return
-                
-            # 检查SMU是否有效
-            if self.smu is None:
-                self.error_sig.emit(Exception("无法获取SMU对象"))
-                return
-                
-            # 设置更长的超时时间（如果可能）
-            try:
-                if hasattr(self.keithley, 'visa') and hasattr(self.keithley.visa, 'timeout'):
-                    original_timeout = self.keithley.visa.timeout
-                    # 设置为较长超时时间（30秒）
-                    self.keithley.visa.timeout = 30000
-            except Exception as e:
-                print(f"设置超时时间出错: {str(e)}")
-                
-            self.time_data = []
-            self.voltage_data = []
-            self.current_data = []
-            self.start_time = time.time()
-            consecutive_errors = 0  # 连续错误计数
-            max_consecutive_errors = 3  # 最大连续错误次数
-
-            while self.running:
-                try:
-                    # 读取当前电压和电流
-                    v = self.smu.measure.v()
-                    i = self.smu.measure.i()
-                    t = time.time() - self.start_time
-                    
-                    self.time_data.append(t)
-                    self.voltage_data.append(v)
-                    self.current_data.append(i)
-                    
-                    # 发送数据到主线程
-                    data = {
-                        "time": self.time_data,
-                        "voltage": self.voltage_data,
-                        "current": self.current_data,
-                        "last_value": (t, v, i)
-                    }
-                    self.data_sig.emit(data)
-                    
-                    # 重置连续错误计数
-                    consecutive_errors = 0
-                    
-                except pyvisa.VisaIOError as visa_error:
-                    consecutive_errors += 1
-                    print(f"VISA通信错误 ({consecutive_errors}/{max_consecutive_errors}): {str(visa_error)}")
-                    
-                    # 如果是超时错误，尝试恢复连接
-                    if "VI_ERROR_TMO" in str(visa_error):
-                        print("通信超时，尝试恢复...")
-                        try:
-                            # 短暂暂停
-                            time.sleep(0.5)
-                            # 尝试简单的读取操作来恢复连接
-                            if hasattr(self.keithley, 'reset'):
-                                print("正在重置设备连接...")
-                                self.keithley.reset()
-                                time.sleep(1)
-                        except Exception as recover_error:
-                            print(f"恢复连接尝试失败: {str(recover_error)}")
-                    
-                    # 如果连续错误次数超过阈值，退出循环
-                    if consecutive_errors >= max_consecutive_errors:
-                        self.error_sig.emit(Exception(f"多次测量失败，停止测量: {str(visa_error)}"))
-                        break
-                    
-                    # 继续尝试下一次测量
-                    continue
-                        
-                except Exception as e:
-                    consecutive_errors += 1
-                    print(f"测量过程中出错 ({consecutive_errors}/{max_consecutive_errors}): {str(e)}")
-                    
-                    # 如果连续错误次数超过阈值，退出循环
-                    if consecutive_errors >= max_consecutive_errors:
-                        self.error_sig.emit(e)
-                        break
-                    
-                    # 继续尝试下一次测量
-                    continue
-                    
-                # 等待指定间隔
-                time.sleep(self.interval)
-                
-        except Exception as exc:
-            self.error_sig.emit(exc)
-        finally:
-            # 恢复原始超时设置
+        simulated_voltage = self.current_voltage
+        t = (time.perf_counter_ns() - self.start_ns) * 1e-9
+
+        # 电流：基准值 + 与电压成正比的分量 + 正弦波动 + 随机噪声
+        current_scale = abs(simulated_voltage) * 2e-6
+        sine_component = amplitude * math.sin(2 * math.pi * frequency * t)
+        noise = random.uniform(-noise_level, noise_level) * amplitude
+        i = baseline + current_scale + sine_component + noise
+
+        self._deliver_sample(t, simulated_voltage, i)
+
+    # 以下方法返回读取电压和电流的函数，驱动对象的属性只在创建时查找一次
+
+    def _vi_reader_combined(self):
+        """通过smu.measure.iv()在一次VISA查询中读取电流和电压"""
+        measure_iv = self.smu.measure.iv
+
+        def read_vi():
+            i, v = measure_iv()
+            return float(v), float(i)
+
+        return read_vi
+
+    def _vi_reader_script(self):
+        """在一次查询中分别执行measure.v()和measure.i()"""
+        query = self.keithley._query
+        name = self.smu_name
+        script = f"{name}.measure.v(), {name}.measure.i()"
+
+        def read_vi():
+            v, i = query(script)
+            return float(v), float(i)
+
+        return read_vi
+
+    def _vi_reader_sequential(self):
+        """依次读取电压和电流，需要两次VISA查询"""
+        measure = self.smu.measure
+        measure_v = measure.v
+        measure_i = measure.i
+
+        def read_vi():
+            return measure_v(), measure_i()
+
+        return read_vi
+
+    def _measure_vi(self):
+        """读取电压和电流，首次调用时选择设备支持的最快方法"""
+        if self._read_vi is not None:
+            return self._read_vi()
+
+        for make_reader in (self._vi_reader_combined, self._vi_reader_script):
             try:
-                if hasattr(self.keithley, 'visa') and hasattr(self.keithley.visa, 'timeout') and 'original_timeout' in locals():
-                    self.keithley.visa.timeout = original_timeout
+                read_vi = make_reader()
+                v, i = read_vi()
+            except pyvisa.VisaIOError:
+                # 通信错误而非不支持该方法
+                raise
             except Exception:
-                pass
-                
-            self.finished_sig.emit()
+                continue
+            self._read_vi = read_vi
+            return v, i
+
+        read_vi = self._vi_reader_sequential()
+        v, i = read_vi()
+        self._read_vi = read_vi
+        return v, i
+
+    def _reset_device(self):
+        """通信超时后重置设备，并在下次测量前再暂停一段时间"""
+        self._reset_pending = False
+        try:
+            logger.info("正在重置设备连接...")
+            self.keithley.reset()
+        except Exception as recover_error:
+            logger.warning("恢复连接尝试失败: %s", recover_error)
+        self._hold_off = 1.0
+
+    def _measure(self):
+        """读取一次电压和电流"""
+        try:
+            v, i = self._measure_vi()
+            t = (time.perf_counter_ns() - self.start_ns) * 1e-9
+
+            self._deliver_sample(t, v, i)
+
+            # 重置连续错误计数
+            self._consecutive_errors = 0
+
+        except pyvisa.VisaIOError as visa_error:
+            self._consecutive_errors += 1
+            logger.warning(
+                "VISA通信错误 (%d/%d): %s",
+                self._consecutive_errors, self.MAX_CONSECUTIVE_ERRORS, visa_error,
+            )
+
+            # 如果是超时错误，短暂暂停后重置设备以恢复连接
+            if "VI_ERROR_TMO" in str(visa_error):
+                logger.info("通信超时，尝试恢复...")
+                self._reset_pending = True
+                self._hold_off = 0.5
+
+            # 如果连续错误次数超过阈值，停止测量
+            if self._consecutive_errors >= self.MAX_CONSECUTIVE_ERRORS:
+                self.error_sig.emit(Exception(f"多次测量失败，停止测量: {str(visa_error)}"))
+                self.stop()
+
+        except Exception as e:
+            self._consecutive_errors += 1
+            logger.warning(
+                "测量过程中出错 (%d/%d): %s",
+                self._consecutive_errors, self.MAX_CONSECUTIVE_ERRORS, e,
+            )
+
+            # 如果连续错误次数超过阈值，停止测量
+            if self._consecutive_errors >= self.MAX_CONSECUTIVE_ERRORS:
+                self.error_sig.emit(e)
+                self.stop()
 
 
 def run():
@@ -38,6 +38,7 @@ class SweepDataPlot(pg.GraphicsView):
         LW = 1.5
 
     _init_done = False
+    _live_line = None
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
@@ -249,3 +250,39 @@ class SweepDataPlot(pg.GraphicsView):
         # 自动调整范围
         self.p.autoRange()
         self.update_darkmode()
+
+    def init_line(self, x_label="X", y_label="Y", title=""):
+        """
+        准备一条实时更新的空曲线，之后通过 :meth:`update_line` 更新数据
+
+        与 :meth:`plot_xy` 不同，曲线不进行抗锯齿，只绘制可见范围内的数据，并且
+        坐标范围随数据自动调整，更新时只重绘曲线本身。
+
+        :param x_label: X轴标签
+        :param y_label: Y轴标签
+        :param title: 图表标题
+        :returns: 创建的曲线
+        """
+        self.clear()
+
+        self.setTitle(title)
+        self.x_axis.setLabel(x_label, color="k", size="12pt")
+        self.y_axis.setLabel(y_label, color="k", size="12pt")
+        self.p.setLogMode(x=False, y=False)
+
+        pen = fn.mkPen(color=COLORS[0], width=self.LW)
+        self._live_line = self.p.plot(pen=pen, antialias=False, clipToView=True)
+
+        self.p.enableAutoRange(x=True, y=True)
+        self.update_darkmode()
+
+        return self._live_line
+
+    def update_line(self, x_data, y_data):
+        """
+        更新 :meth:`init_line` 创建的曲线的数据
+
+        :param x_data: X轴数据数组
+        :param y_data: Y轴数据数组
+        """
+        self._live_line.setData(x_data, y_data)
@@ -1,4 +1,22 @@
+import os.path as osp
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithUi(build_py):
+    """Compiles the main window layout to a Python module with pyuic."""
+
+    def run(self):
+        from PyQt5.uic import compileUi
+
+        src = osp.join("keithleygui", "main.ui")
+        dst = osp.join("keithleygui", "ui_main.py")
+
+        with open(src) as ui_file, open(dst, "w") as py_file:
+            compileUi(ui_file, py_file)
+
+        build_py.run(self)
+
 
 setup(
     name="keithleygui",
@@ -27,6 +45,7 @@ setup(
         "repr",
         "setuptools",
     ],
+    cmdclass={"build_py": BuildPyWithUi},
     zip_safe=False,
     keywords="keithleygui",
     classifiers=[